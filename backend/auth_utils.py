@@ -1,52 +1,63 @@
 """
 Authentication utilities for password hashing and verification
+New hashes use Argon2id; existing bcrypt hashes still verify and are upgraded on sign-in
 """
 
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+# Argon2id at the OWASP-recommended minimum (19 MiB, 2 iterations) - cheaper per sign-in than bcrypt rounds=12
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+ARGON2_PREFIX = "$argon2"
+
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
-    # Convert password to bytes if it's a string
-    if isinstance(password, str):
-        password_bytes = password.encode('utf-8')
-    else:
-        password_bytes = password
-    
-    # Bcrypt has a 72-byte limit, truncate if necessary
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
-    
-    # Generate salt and hash
-    salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    
-    # Return as string
-    return hashed.decode('utf-8')
+    """Hash a password using Argon2id"""
+    return password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
+    """Verify a password against its hash (Argon2 or legacy bcrypt)"""
     if not hashed_password:
         return False
-    
+
+    if isinstance(hashed_password, bytes):
+        hashed_password = hashed_password.decode('utf-8')
+
+    if hashed_password.startswith(ARGON2_PREFIX):
+        try:
+            return password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    return verify_bcrypt_password(plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash is legacy bcrypt or uses outdated Argon2 parameters"""
+    if not hashed_password.startswith(ARGON2_PREFIX):
+        return True
+    return password_hasher.check_needs_rehash(hashed_password)
+
+
+def verify_bcrypt_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a legacy bcrypt hash"""
     # Convert to bytes
     if isinstance(plain_password, str):
         password_bytes = plain_password.encode('utf-8')
     else:
         password_bytes = plain_password
-    
-    if isinstance(hashed_password, str):
-        hash_bytes = hashed_password.encode('utf-8')
-    else:
-        hash_bytes = hashed_password
-    
+
+    hash_bytes = hashed_password.encode('utf-8')
+
     # Bcrypt has a 72-byte limit, truncate if necessary
     if len(password_bytes) > 72:
         password_bytes = password_bytes[:72]
-    
+
     # Verify password
     try:
         return bcrypt.checkpw(password_bytes, hash_bytes)
     except Exception:
         return False
-
@@ -3,9 +3,10 @@ Database models and setup using SQLAlchemy with SQLite
 Uses UUID primary keys for offline-sync capability
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, ForeignKey, DateTime, Date, Float, Text, event
+from sqlalchemy import create_engine, text, Column, Integer, String, Boolean, ForeignKey, DateTime, Date, Float, Text, Index, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.pool import QueuePool
 from datetime import datetime
 import os
 from uuid_utils import generate_uuid
@@ -22,7 +23,27 @@ if "sqlite" in DATABASE_URL:
 else:
     connect_args = {}
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+# Connection pool - keep warm connections around instead of reconnecting per request.
+# Keep (uvicorn workers * (pool size + overflow)) below the database's connection limit.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))  # Seconds before a connection is replaced
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection before failing
+
+if ":memory:" in DATABASE_URL or DATABASE_URL.rstrip("/") == "sqlite:":
+    # In-memory SQLite uses a single-connection pool that takes no sizing options
+    pool_args = {}
+else:
+    pool_args = {
+        "poolclass": QueuePool,  # Explicit - file SQLite and server databases both get a sized pool
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,  # Detect stale connections before handing them out
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_timeout": DB_POOL_TIMEOUT
+    }
+
+engine = create_engine(DATABASE_URL, connect_args=connect_args, **pool_args)
 
 # Enable WAL mode for SQLite (allows concurrent reads/writes)
 if "sqlite" in DATABASE_URL:
@@ -33,10 +54,14 @@ if "sqlite" in DATABASE_URL:
         cursor.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging for better concurrency
         cursor.execute("PRAGMA synchronous=NORMAL")  # Balanced performance/safety
         cursor.execute("PRAGMA foreign_keys=ON")  # Enable foreign key constraints
+        cursor.execute("PRAGMA temp_store=MEMORY")  # Keep temp tables/sort spills in memory
+        cursor.execute("PRAGMA mmap_size=268435456")  # Memory-map up to 256MB of the database file for reads
         cursor.close()
 
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: handlers serialize the objects they just wrote after commit, so keep
+# the in-memory values instead of reloading every attribute with another SELECT
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
@@ -147,7 +172,7 @@ class TaskCompletion(Base):
     task_occurrence_id = Column(String, ForeignKey("TaskOccurrences.id"), nullable=False)  # UUID foreign key
     instrument_id = Column(String, nullable=False)  # UUID denormalized for easier queries
     task_type = Column(String, nullable=False)
-    completed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    completed_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     notes = Column(String, nullable=True)
     photo_url = Column(String, nullable=True)
 
@@ -176,7 +201,7 @@ class PracticeSession(Base):
     
     id = Column(String, primary_key=True, index=True, default=generate_uuid)  # UUID
     instrument_id = Column(String, ForeignKey("Instrument.id"), nullable=False)  # UUID foreign key
-    practice_session_definition_id = Column(String, ForeignKey("PracticeSessionDefinition.id"), nullable=False)  # UUID foreign key
+    practice_session_definition_id = Column(String, ForeignKey("PracticeSessionDefinition.id"), nullable=False, index=True)  # UUID foreign key
     start_time = Column(DateTime, nullable=True, index=True)  # When practice started (used for date filtering)
     end_time = Column(DateTime, nullable=True)  # When practice ended
     duration = Column(Integer, nullable=True)  # Duration in milliseconds
@@ -189,11 +214,22 @@ class PracticeSession(Base):
     # Relationships
     instrument = relationship("Instrument", back_populates="practice_sessions")
     practice_session_definition = relationship("PracticeSessionDefinition", back_populates="practice_sessions")
+    
+    __table_args__ = (
+        # Covers the common instrument_id + start_time range + order by start_time filter
+        Index("ix_ps_instr_start", "instrument_id", "start_time"),
+        # instrument_id + practice_session_definition_id + start_time range (get_practice_sessions)
+        Index("ix_ps_instr_def_start", "instrument_id", "practice_session_definition_id", "start_time"),
+    )
 
 
 def init_db():
-    """Create all database tables"""
+    """Create all database tables, plus any indexes added to existing tables"""
     Base.metadata.create_all(bind=engine)
+    # create_all() skips existing tables, so create newly declared indexes explicitly
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 
 def get_db():
@@ -204,3 +240,18 @@ def get_db():
     finally:
         db.close()
 
+
+def get_read_db():
+    """Dependency for read-only endpoints - runs all queries in one deferred (read) transaction that is never committed"""
+    db = SessionLocal()
+    try:
+        if "sqlite" in DATABASE_URL:
+            # Takes only a shared read lock; with WAL, writers are not blocked
+            db.execute(text("BEGIN DEFERRED"))
+        else:
+            db.execute(text("SET TRANSACTION READ ONLY"))
+        yield db
+    finally:
+        db.rollback()
+        db.close()
+
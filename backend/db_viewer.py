@@ -12,8 +12,8 @@ from database import Instrument, TaskDefinition, TaskOccurrence, TaskCompletion,
 router = APIRouter()
 
 
-@router.get("/admin/db-viewer", response_class=HTMLResponse)
-async def db_viewer(db: Session = Depends(get_db)):
+@router.get("/db-viewer", response_class=HTMLResponse)  # Mounted under /admin in main.py
+def db_viewer(db: Session = Depends(get_db)):
     """Simple HTML viewer for the database"""
     
     # Get all data
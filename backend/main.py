@@ -6,31 +6,82 @@ Handles instruments, tasks, scheduling, and analytics
 from fastapi import FastAPI, HTTPException, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, Response, HTMLResponse
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.responses import FileResponse, Response, HTMLResponse, ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic.fields import FieldInfo
+from typing import Any, List, Literal, Optional
 from enum import Enum
+from functools import lru_cache
+from itertools import islice
+from urllib.parse import urlsplit, parse_qsl
+import inspect
 import os
-from datetime import datetime, date, timedelta
+import sys
+from time import monotonic
+from datetime import datetime, date, time, timedelta, timezone
 import json
+import orjson
 import csv
 from io import StringIO
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, text, func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy import and_, or_, text, func, select, insert, update, delete, case, bindparam
 from database import (
-    init_db, get_db, Base, engine, Instrument as DBInstrument, TaskDefinition as DBTaskDefinition,
+    init_db, get_db, get_read_db, SessionLocal, Base, engine, Instrument as DBInstrument, TaskDefinition as DBTaskDefinition,
     TaskOccurrence as DBTaskOccurrence, TaskCompletion as DBTaskCompletion, UserProfile as DBUserProfile,
     PracticeSessionDefinition as DBPracticeSessionDefinition, PracticeSession as DBPracticeSession
 )
 from instrument_list import get_instruments_list
 from db_viewer import router as db_viewer_router
 from uuid_utils import generate_uuid
-from auth_utils import hash_password, verify_password
+from auth_utils import hash_password, verify_password, password_needs_rehash
+from response_cache import cache_get, cache_set, cache_clear, cache_generation
 
-app = FastAPI(title="Practice Tracker API", version="1.0.0")
+# Cached tz object for timestamps (datetime.utcnow() is deprecated)
+_UTC = timezone.utc
 
-# Include database viewer router
-app.include_router(db_viewer_router)
+def utc_now() -> datetime:
+    """Current UTC time as a naive datetime - the form the DateTime columns store and load"""
+    return datetime.now(_UTC).replace(tzinfo=None)
+
+# ISO datetime parser - Python 3.11+ fromisoformat accepts a trailing "Z" directly
+if sys.version_info >= (3, 11):
+    parse_iso_datetime = datetime.fromisoformat
+else:
+    try:
+        from ciso8601 import parse_datetime as parse_iso_datetime  # C parser, much faster than stdlib
+    except ImportError:
+        def parse_iso_datetime(value: str) -> datetime:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def parse_utc_datetime(value: str) -> datetime:
+    """Parse an ISO datetime to naive UTC - the form the DateTime columns store and load"""
+    parsed = parse_iso_datetime(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(_UTC).replace(tzinfo=None)
+    return parsed
+
+def parse_iso_date(value: str) -> date:
+    """Parse a YYYY-MM-DD date or a full ISO datetime string down to its date"""
+    if len(value) == 10:  # YYYY-MM-DD format
+        return date.fromisoformat(value)
+    return parse_iso_datetime(value).date()
+
+# orjson-backed responses by default (much faster than stdlib json for large lists/exports)
+# Concurrency model: handlers that use the (sync) SQLAlchemy session are plain `def`, so FastAPI
+# runs them in its threadpool instead of blocking the event loop. `async def` is only used where
+# nothing blocks, or where blocking work is explicitly offloaded (run_in_threadpool).
+app = FastAPI(title="Practice Tracker API", version="1.0.0", default_response_class=ORJSONResponse)
+
+# Database viewer lives on its own sub-app mounted at /admin - kept out of the API
+# route table and OpenAPI schema
+admin_app = FastAPI(openapi_url=None)
+admin_app.include_router(db_viewer_router)
+app.mount("/admin", admin_app)
 
 # Initialize database on startup
 @app.on_event("startup")
@@ -40,30 +91,31 @@ async def startup_event():
     init_db()
     print("✓ Database initialized (tables created if needed)")
     
-    # Ensure "Practice General" practice session definition exists
-    db = next(get_db())
-    try:
-        practice_general = db.query(DBPracticeSessionDefinition).filter(
-            DBPracticeSessionDefinition.name == "Practice General"
-        ).first()
-        
-        if not practice_general:
-            print("Creating 'Practice General' practice session definition...")
-            practice_general = DBPracticeSessionDefinition(
-                id=generate_uuid(),
-                name="Practice General",
-                description="General practice session"
+    # Ensure "Practice General" practice session definition exists (single INSERT ... ON CONFLICT DO NOTHING)
+    dialect_insert = postgresql_insert if engine.dialect.name == "postgresql" else sqlite_insert
+    with SessionLocal() as db:
+        try:
+            result = db.execute(
+                dialect_insert(DBPracticeSessionDefinition).values(
+                    id=generate_uuid(),
+                    name="Practice General",
+                    description="General practice session"
+                ).on_conflict_do_nothing(index_elements=["name"])
             )
-            db.add(practice_general)
             db.commit()
-            print(f"✓ Created Practice General (ID: {practice_general.id})")
-        else:
-            print(f"✓ Practice General already exists (ID: {practice_general.id})")
-    except Exception as e:
-        print(f"⚠️ Error checking/creating Practice General: {e}")
-        db.rollback()
-    finally:
-        db.close()
+            # Cache the ID so request handlers don't need to look it up
+            app.state.practice_general_id = db.execute(
+                select(DBPracticeSessionDefinition.id).where(DBPracticeSessionDefinition.name == "Practice General")
+            ).scalar_one()
+            # Definitions may have changed while the app was down (shared Redis cache)
+            cache_clear("practice-session-definitions")
+            if result.rowcount:
+                print(f"✓ Created Practice General (ID: {app.state.practice_general_id})")
+            else:
+                print(f"✓ Practice General already exists (ID: {app.state.practice_general_id})")
+        except Exception as e:
+            print(f"⚠️ Error checking/creating Practice General: {e}")
+            db.rollback()
     
     # Note: For schema changes/migrations in the future, use proper migration tools like Alembic
 
@@ -159,6 +211,9 @@ class TaskCompletion(BaseModel):
     notes: Optional[str] = None
     photo_url: Optional[str] = None  # In production, handle file uploads
 
+class RescheduleRequest(BaseModel):
+    due_date: date  # Validated by pydantic - invalid dates are rejected with 422
+
 class PracticeSessionDefinition(BaseModel):
     id: Optional[str] = None  # UUID
     name: str
@@ -255,71 +310,179 @@ class AuthResponse(BaseModel):
     username: Optional[str] = None
     message: str = "Success"
 
+# Batch models
+class BatchItem(BaseModel):
+    method: str = "GET"
+    path: str  # e.g. "/api/tasks?start_date=2024-01-01"
+    body: Optional[dict] = None
+
+class BatchResult(BaseModel):
+    status: int
+    body: Any = None
+
+# Fields that are constant in the legacy TaskOccurrence format
+LEGACY_TASK_TEMPLATE = {
+    "task_definition_id": "",  # Not applicable for PracticeSession
+    "task_type": "Practice"  # Default to Practice
+}
+
+def practice_session_row_to_task_dict(row) -> dict:
+    """Convert a LEGACY_TASK_COLUMNS row to the legacy TaskOccurrence format (backward compatibility)"""
+    # Column values are kept as-is: orjson renders date/datetime to the same ISO strings as .isoformat(), in C
+    task = row._asdict()
+    start_time = task["start_time"]
+    # Extract date from start_time for due_date field (backward compatibility)
+    task["due_date"] = start_time.date() if start_time else None
+    task.update(LEGACY_TASK_TEMPLATE)
+    return task
+
+# PracticeSession columns needed for the legacy TaskOccurrence format
+LEGACY_TASK_COLUMNS = (
+    DBPracticeSession.id, DBPracticeSession.instrument_id, DBPracticeSession.start_time,
+    DBPracticeSession.end_time, DBPracticeSession.duration, DBPracticeSession.completed,
+    DBPracticeSession.completed_at, DBPracticeSession.notes, DBPracticeSession.photo_url,
+    DBPracticeSession.practice_session_definition_id
+)
+
+# Legacy by-date statements, built once at import and re-bound per request - SQLAlchemy's compiled
+# cache then serves the SQL without rebuilding or recompiling the statement each call
+LEGACY_TASKS_ON_DAY = select(*LEGACY_TASK_COLUMNS).where(
+    # start_time range (index seek) instead of func.date(start_time) == day
+    DBPracticeSession.start_time >= bindparam("day_start"),
+    DBPracticeSession.start_time < bindparam("day_end")
+)
+LEGACY_OPEN_TASKS_ON_DAY = LEGACY_TASKS_ON_DAY.where(DBPracticeSession.completed == False)
+LEGACY_OPEN_TASKS_BEFORE_DAY = select(*LEGACY_TASK_COLUMNS).where(
+    DBPracticeSession.start_time < bindparam("day_start"),
+    DBPracticeSession.completed == False
+)
+
+def day_bounds(day: date) -> dict:
+    """day_start/day_end bind parameters covering one calendar day"""
+    # Storage-format assumption: on SQLite these bounds compare as strings against start_time, so
+    # stored values must be in SQLAlchemy's 'YYYY-MM-DD HH:MM:SS.ffffff' form (everything the app
+    # writes is). Rows written otherwise, e.g. 'YYYY-MM-DD 00:00:00' from older migrations, sort
+    # before day_start - run normalize_practice_session_times.py once on such databases
+    day_start = datetime.combine(day, time.min)
+    return {"day_start": day_start, "day_end": day_start + timedelta(days=1)}
+
+def select_legacy_tasks(db: Session, stmt, params: dict) -> list:
+    """Run a legacy by-date statement, as legacy TaskOccurrence dicts (no ORM objects)"""
+    return [practice_session_row_to_task_dict(row) for row in db.execute(stmt, params)]
+
+# Profile update field groups
+# (field, clear when missing) - username/email are kept when omitted, the rest are cleared
+PROFILE_TEXT_FIELDS = (
+    ("username", False),
+    ("email", False),
+    ("primary_instrument", True),
+    ("secondary_instruments", True),
+    ("practice_routine_description", True),
+    ("biography", True),
+)
+PROFILE_SCALAR_FIELDS = ("age_commenced_playing", "daily_practice_hours", "days_per_week_practising")
+PROFILE_SETTING_FIELDS = ("reminder_hours", "notifications_enabled")
+GENDER_VALUES = frozenset(g.value for g in Gender)
+
 # Helper functions
+# The *_to_dict helpers build JSON-ready dicts straight from ORM attributes; list endpoints
+# return them via ORJSONResponse to skip Pydantic validation and jsonable_encoder per row.
+def db_instrument_to_dict(db_instrument: DBInstrument) -> dict:
+    """Convert database Instrument model to a plain dict"""
+    return {
+        "id": db_instrument.id,
+        "user_profile_id": db_instrument.user_profile_id,
+        "name": db_instrument.name,
+        "category": db_instrument.category,
+        "instrument_type": db_instrument.instrument_type or InstrumentType.PRIMARY.value,
+        "notes": db_instrument.notes,
+        "created_at": db_instrument.created_at.isoformat() if db_instrument.created_at else None,
+        "updated_at": db_instrument.updated_at.isoformat() if db_instrument.updated_at else None
+    }
+
 def db_instrument_to_pydantic(db_instrument: DBInstrument) -> Instrument:
     """Convert database Instrument model to Pydantic Instrument model"""
-    return Instrument(
-        id=db_instrument.id,
-        user_profile_id=db_instrument.user_profile_id,
-        name=db_instrument.name,
-        category=db_instrument.category,
-        instrument_type=InstrumentType(db_instrument.instrument_type) if db_instrument.instrument_type else InstrumentType.PRIMARY,
-        notes=db_instrument.notes,
-        created_at=db_instrument.created_at.isoformat() if db_instrument.created_at else None,
-        updated_at=db_instrument.updated_at.isoformat() if db_instrument.updated_at else None
-    )
+    return Instrument(**db_instrument_to_dict(db_instrument))
+
+def db_task_definition_to_dict(db_task_def: DBTaskDefinition) -> dict:
+    """Convert database TaskDefinition to a plain dict"""
+    return {
+        "id": db_task_def.id,
+        "instrument_id": db_task_def.instrument_id,
+        "task_type": db_task_def.task_type,
+        "frequency_type": db_task_def.frequency_type,
+        "frequency_value": db_task_def.frequency_value,
+        "start_date": db_task_def.start_date.isoformat(),
+        "created_at": db_task_def.created_at.isoformat() if db_task_def.created_at else None
+    }
 
 def db_task_definition_to_pydantic(db_task_def: DBTaskDefinition) -> TaskDefinition:
     """Convert database TaskDefinition to Pydantic model"""
-    return TaskDefinition(
-        id=db_task_def.id,
-        instrument_id=db_task_def.instrument_id,
-        task_type=db_task_def.task_type,
-        frequency_type=db_task_def.frequency_type,
-        frequency_value=db_task_def.frequency_value,
-        start_date=db_task_def.start_date.isoformat(),
-        created_at=db_task_def.created_at.isoformat() if db_task_def.created_at else None
-    )
+    return TaskDefinition(**db_task_definition_to_dict(db_task_def))
+
+def db_task_occurrence_to_dict(db_task_occ: DBTaskOccurrence) -> dict:
+    """Convert database TaskOccurrence to a plain dict"""
+    return {
+        "id": db_task_occ.id,
+        "task_definition_id": db_task_occ.task_definition_id,
+        "instrument_id": db_task_occ.instrument_id,
+        "due_date": db_task_occ.due_date.isoformat(),
+        "task_type": db_task_occ.task_type,
+        "completed": db_task_occ.completed,
+        "completed_at": db_task_occ.completed_at.isoformat() if db_task_occ.completed_at else None,
+        "notes": db_task_occ.notes,
+        "photo_url": db_task_occ.photo_url
+    }
 
 def db_task_occurrence_to_pydantic(db_task_occ: DBTaskOccurrence) -> TaskOccurrence:
     """Convert database TaskOccurrence to Pydantic model"""
-    return TaskOccurrence(
-        id=db_task_occ.id,
-        task_definition_id=db_task_occ.task_definition_id,
-        instrument_id=db_task_occ.instrument_id,
-        due_date=db_task_occ.due_date.isoformat(),
-        task_type=db_task_occ.task_type,
-        completed=db_task_occ.completed,
-        completed_at=db_task_occ.completed_at.isoformat() if db_task_occ.completed_at else None,
-        notes=db_task_occ.notes,
-        photo_url=db_task_occ.photo_url
-    )
+    return TaskOccurrence(**db_task_occurrence_to_dict(db_task_occ))
+
+def db_task_completion_to_dict(db_completion: DBTaskCompletion) -> dict:
+    """Convert database TaskCompletion to a plain dict"""
+    return {
+        "id": db_completion.id,
+        "task_occurrence_id": db_completion.task_occurrence_id,
+        "instrument_id": db_completion.instrument_id,
+        "task_type": db_completion.task_type,
+        "completed_at": db_completion.completed_at.isoformat() if db_completion.completed_at else None,
+        "notes": db_completion.notes,
+        "photo_url": db_completion.photo_url
+    }
+
+def db_practice_session_definition_to_dict(db_def: DBPracticeSessionDefinition) -> dict:
+    """Convert database PracticeSessionDefinition to a plain dict"""
+    return {
+        "id": db_def.id,
+        "name": db_def.name,
+        "description": db_def.description,
+        "created_at": db_def.created_at.isoformat() if db_def.created_at else None,
+        "updated_at": db_def.updated_at.isoformat() if db_def.updated_at else None
+    }
 
 def db_practice_session_definition_to_pydantic(db_def: DBPracticeSessionDefinition) -> PracticeSessionDefinition:
     """Convert database PracticeSessionDefinition to Pydantic model"""
-    return PracticeSessionDefinition(
-        id=db_def.id,
-        name=db_def.name,
-        description=db_def.description,
-        created_at=db_def.created_at.isoformat() if db_def.created_at else None,
-        updated_at=db_def.updated_at.isoformat() if db_def.updated_at else None
-    )
+    return PracticeSessionDefinition(**db_practice_session_definition_to_dict(db_def))
+
+def db_practice_session_to_dict(db_session: DBPracticeSession) -> dict:
+    """Convert database PracticeSession to a plain dict"""
+    return {
+        "id": db_session.id,
+        "instrument_id": db_session.instrument_id,
+        "practice_session_definition_id": db_session.practice_session_definition_id,
+        "start_time": db_session.start_time.isoformat() if db_session.start_time else None,
+        "end_time": db_session.end_time.isoformat() if db_session.end_time else None,
+        "duration": db_session.duration,
+        "completed": db_session.completed,
+        "completed_at": db_session.completed_at.isoformat() if db_session.completed_at else None,
+        "notes": db_session.notes,
+        "photo_url": db_session.photo_url,
+        "updated_at": db_session.updated_at.isoformat() if db_session.updated_at else None
+    }
 
 def db_practice_session_to_pydantic(db_session: DBPracticeSession) -> PracticeSession:
     """Convert database PracticeSession to Pydantic model"""
-    return PracticeSession(
-        id=db_session.id,
-        instrument_id=db_session.instrument_id,
-        practice_session_definition_id=db_session.practice_session_definition_id,
-        start_time=db_session.start_time.isoformat() if db_session.start_time else None,
-        end_time=db_session.end_time.isoformat() if db_session.end_time else None,
-        duration=db_session.duration,
-        completed=db_session.completed,
-        completed_at=db_session.completed_at.isoformat() if db_session.completed_at else None,
-        notes=db_session.notes,
-        photo_url=db_session.photo_url,
-        updated_at=db_session.updated_at.isoformat() if hasattr(db_session, 'updated_at') and db_session.updated_at else None
-    )
+    return PracticeSession(**db_practice_session_to_dict(db_session))
 
 def db_user_profile_to_pydantic(db_profile: DBUserProfile) -> UserProfile:
     """Convert database UserProfile to Pydantic model"""
@@ -354,59 +517,79 @@ def generate_task_occurrences(task_def: DBTaskDefinition, db: Session, end_date:
     if end_date is None:
         end_date = date.today() + timedelta(days=90)  # Generate 90 days ahead
     
+    # Calculate the step between occurrences in days
+    if task_def.frequency_type == "days":
+        step_days = task_def.frequency_value
+    elif task_def.frequency_type == "weekly":
+        step_days = 7 * task_def.frequency_value
+    elif task_def.frequency_type == "monthly":
+        # Approximate: add 30 days per month
+        step_days = 30 * task_def.frequency_value
+    
+    # Occurrence count is known up front, so build the dates in one pass (no running date arithmetic)
     start = task_def.start_date
-    occurrences = []
-    current_date = start
-    
-    while current_date <= end_date:
-        occurrence = DBTaskOccurrence(
-            id=generate_uuid(),
-            task_definition_id=task_def.id,
-            instrument_id=task_def.instrument_id,
-            due_date=current_date,
-            task_type=task_def.task_type,
-            completed=False,
-            completed_at=None,
-            notes=None,
-            photo_url=None
-        )
-        occurrences.append(occurrence)
-        
-        # Calculate next occurrence
-        if task_def.frequency_type == "days":
-            current_date += timedelta(days=task_def.frequency_value)
-        elif task_def.frequency_type == "weekly":
-            current_date += timedelta(weeks=task_def.frequency_value)
-        elif task_def.frequency_type == "monthly":
-            # Approximate: add 30 days per month
-            current_date += timedelta(days=30 * task_def.frequency_value)
-    
-    # Add all occurrences to database
-    db.add_all(occurrences)
+    count = (end_date - start).days // step_days + 1
+    due_dates = [start + timedelta(days=i * step_days) for i in range(count)]
+    
+    occurrences = [
+        {
+            "id": generate_uuid(),
+            "task_definition_id": task_def.id,
+            "instrument_id": task_def.instrument_id,
+            "due_date": due_date,
+            "task_type": task_def.task_type,
+            "completed": False
+        }
+        for due_date in due_dates
+    ]
+    
+    # Core bulk INSERT (executemany) - skips ORM unit-of-work bookkeeping per object
+    if occurrences:
+        db.execute(insert(DBTaskOccurrence), occurrences)
     db.commit()
     
     return occurrences
 
+# Cached {instrument_id: name} map, keyed on a cheap (max(updated_at), count) signature
+# {instrument_id: name} shared across requests. Trusted for INSTRUMENT_NAME_CACHE_TTL seconds, then
+# revalidated against the table's (max(updated_at), count) signature; local writes invalidate it directly
+INSTRUMENT_NAME_CACHE_TTL = 60
+INSTRUMENT_NAME_CACHE = {"sig": None, "map": {}, "checked_at": None}
+
+def get_instrument_name_map(db: Session) -> dict:
+    """Get {instrument_id: name}, only re-reading the Instrument table when it has changed"""
+    checked_at = INSTRUMENT_NAME_CACHE["checked_at"]
+    if checked_at is not None and monotonic() - checked_at < INSTRUMENT_NAME_CACHE_TTL:
+        return INSTRUMENT_NAME_CACHE["map"]
+    sig = tuple(db.query(func.max(DBInstrument.updated_at), func.count(DBInstrument.id)).one())
+    if sig != INSTRUMENT_NAME_CACHE["sig"]:
+        INSTRUMENT_NAME_CACHE["map"] = dict(db.execute(select(DBInstrument.id, DBInstrument.name)).all())
+        INSTRUMENT_NAME_CACHE["sig"] = sig
+    INSTRUMENT_NAME_CACHE["checked_at"] = monotonic()
+    return INSTRUMENT_NAME_CACHE["map"]
+
+def invalidate_instrument_caches():
+    """Drop cached instrument lists, the name map and analytics after an instrument write"""
+    cache_clear("instruments:")
+    cache_clear("analytics:")
+    INSTRUMENT_NAME_CACHE["checked_at"] = None
+
 def get_completion_streak(db: Session):
     """Calculate consecutive days with at least one completed task"""
-    completions = db.query(DBTaskCompletion).all()
-    
-    if not completions:
-        return 0
-    
-    # Get unique completion dates, sorted descending
-    completion_dates = sorted(
-        set([c.completed_at.date() for c in completions if c.completed_at]),
-        reverse=True
-    )
-    
-    if not completion_dates:
-        return 0
+    # Unique completion dates, newest first - computed in SQL and read lazily,
+    # so only as many days as the streak spans are fetched
+    completion_day = func.date(DBTaskCompletion.completed_at)
+    completion_dates = db.execute(
+        select(completion_day).where(DBTaskCompletion.completed_at.isnot(None)).distinct().order_by(completion_day.desc())
+    ).scalars()
     
     streak = 0
     expected_date = date.today()
     
     for comp_date in completion_dates:
+        # SQLite's date() returns 'YYYY-MM-DD' strings; Postgres returns date objects
+        if isinstance(comp_date, str):
+            comp_date = date.fromisoformat(comp_date)
         if comp_date == expected_date or comp_date == expected_date - timedelta(days=1):
             streak += 1
             expected_date = comp_date - timedelta(days=1)
@@ -415,12 +598,49 @@ def get_completion_streak(db: Session):
     
     return streak
 
+# Large list endpoints stream their JSON in chunks of this many rows (constant memory)
+STREAM_BATCH_SIZE = 500
+
+def stream_json_array(rows, to_dict) -> StreamingResponse:
+    """Stream rows as a JSON array, serializing one chunk of rows at a time instead of building the whole list"""
+    def iter_json():
+        rows_iter = iter(rows)
+        yield b"["
+        separator = b""
+        while True:
+            batch = list(islice(rows_iter, STREAM_BATCH_SIZE))
+            if not batch:
+                break
+            yield separator + b",".join(orjson.dumps(to_dict(row)) for row in batch)
+            separator = b","
+        yield b"]"
+    return StreamingResponse(iter_json(), media_type="application/json")
+
+# Response caching for reference endpoints (Redis when REDIS_URL is set, else in-process)
+# TTLs below apply in full with Redis; the in-process fallback caps them at MEMORY_CACHE_MAX_TTL
+INSTRUMENTS_CACHE_TTL = 60  # Seconds - also invalidated on instrument writes
+DEFINITIONS_CACHE_TTL = 3600
+PRACTICE_TIME_CACHE_TTL = 300  # Also invalidated on practice session writes
+ANALYTICS_CACHE_TTL = 60  # Also invalidated on task, completion and instrument writes
+
+def cached_json_response(key: str, expire: int, build) -> Response:
+    """Serve pre-serialized JSON from the response cache, building and storing it on a miss"""
+    body = cache_get(key)
+    if body is None:
+        # A write's cache_clear during build() bumps the generation, so the possibly stale result isn't stored
+        generation = cache_generation()
+        body = orjson.dumps(build())
+        cache_set(key, body, expire, generation)
+    return Response(content=body, media_type="application/json")
+
+def cached_analytics(name: str, build) -> Response:
+    """Cached analytics response - keyed by day too, so rolling windows and streaks never outlive midnight"""
+    return cached_json_response(f"analytics:{name}:{date.today().isoformat()}", ANALYTICS_CACHE_TTL, build)
+
 # API Routes
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Root endpoint with navigation"""
-    html = """
+# Root page is static, so encode it once at import time
+ROOT_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -458,11 +678,15 @@ async def root():
         </div>
     </body>
     </html>
-    """
-    return html
+""".encode("utf-8")
+
+@app.get("/", response_class=HTMLResponse, include_in_schema=False)
+async def root():
+    """Root endpoint with navigation"""
+    return HTMLResponse(content=ROOT_HTML, headers={"Cache-Control": "public, max-age=3600"})
 
-@app.get("/api/health")
-async def health_check(db: Session = Depends(get_db)):
+@app.get("/api/health", include_in_schema=False)
+def health_check(db: Session = Depends(get_db)):
     """Health check endpoint - checks both API and database connectivity"""
     db_connected = False
     try:
@@ -483,16 +707,41 @@ async def health_check(db: Session = Depends(get_db)):
 
 # Instrument endpoints
 @app.get("/api/instruments", response_model=List[Instrument])
-async def get_instruments(user_id: Optional[str] = None, db: Session = Depends(get_db)):
+def get_instruments(user_id: Optional[str] = None, db: Session = Depends(get_read_db)):
     """Get instruments - optionally filtered by user_id"""
-    query = db.query(DBInstrument)
+    def build():
+        query = db.query(DBInstrument)
+        if user_id:
+            query = query.filter(DBInstrument.user_profile_id == user_id)
+        return [db_instrument_to_dict(instr) for instr in query.all()]
+    return cached_json_response(f"instruments:{user_id or ''}", INSTRUMENTS_CACHE_TTL, build)
+
+@app.get("/api/instruments/full")
+def get_instruments_full(user_id: Optional[str] = None, since: Optional[date] = None, db: Session = Depends(get_read_db)):
+    """Get instruments with their task definitions and recent practice sessions in one request (dashboard)"""
+    # Sessions since the given ISO date, default last 30 days
+    cutoff = since or date.today() - timedelta(days=30)
+    # selectinload: one extra query per relationship for all instruments, instead of one per instrument
+    query = db.query(DBInstrument).options(
+        selectinload(DBInstrument.task_definitions),
+        selectinload(DBInstrument.practice_sessions.and_(
+            DBPracticeSession.start_time >= datetime.combine(cutoff, time.min)
+        ))
+    )
     if user_id:
         query = query.filter(DBInstrument.user_profile_id == user_id)
-    db_instruments = query.all()
-    return [db_instrument_to_pydantic(instr) for instr in db_instruments]
+    
+    return ORJSONResponse([
+        {
+            **db_instrument_to_dict(instr),
+            "task_definitions": [db_task_definition_to_dict(td) for td in instr.task_definitions],
+            "practice_sessions": [db_practice_session_to_dict(ps) for ps in instr.practice_sessions]
+        }
+        for instr in query.all()
+    ])
 
 @app.get("/api/instruments/{instrument_id}", response_model=Instrument)
-async def get_instrument_item(instrument_id: str, db: Session = Depends(get_db)):
+def get_instrument_item(instrument_id: str, db: Session = Depends(get_db)):
     """Get a specific instrument item"""
     item = db.query(DBInstrument).filter(DBInstrument.id == instrument_id).first()
     if not item:
@@ -500,23 +749,23 @@ async def get_instrument_item(instrument_id: str, db: Session = Depends(get_db))
     return db_instrument_to_pydantic(item)
 
 @app.post("/api/instruments", response_model=Instrument)
-async def create_instrument(instrument: InstrumentCreate, db: Session = Depends(get_db)):
+def create_instrument(instrument: InstrumentCreate, db: Session = Depends(get_db)):
     """Create new instrument - user_profile_id is optional for private app"""
     new_instrument = DBInstrument(
         id=generate_uuid(),
         user_profile_id=instrument.user_profile_id,  # Can be None for private app
         name=instrument.name,
         category=instrument.category,
-        instrument_type=instrument.instrument_type.value if isinstance(instrument.instrument_type, InstrumentType) else instrument.instrument_type,
+        instrument_type=instrument.instrument_type.value,
         notes=instrument.notes
     )
     db.add(new_instrument)
     db.commit()
-    db.refresh(new_instrument)
+    invalidate_instrument_caches()
     return db_instrument_to_pydantic(new_instrument)
 
 @app.put("/api/instruments/{instrument_id}", response_model=Instrument)
-async def update_instrument(instrument_id: str, instrument: InstrumentCreate, db: Session = Depends(get_db)):
+def update_instrument(instrument_id: str, instrument: InstrumentCreate, db: Session = Depends(get_db)):
     """Update instrument"""
     existing = db.query(DBInstrument).filter(DBInstrument.id == instrument_id).first()
     if not existing:
@@ -524,18 +773,18 @@ async def update_instrument(instrument_id: str, instrument: InstrumentCreate, db
     
     existing.name = instrument.name
     existing.category = instrument.category
-    existing.instrument_type = instrument.instrument_type.value if isinstance(instrument.instrument_type, InstrumentType) else instrument.instrument_type
+    existing.instrument_type = instrument.instrument_type.value
     existing.notes = instrument.notes
     if instrument.user_profile_id:
         existing.user_profile_id = instrument.user_profile_id
-    existing.updated_at = datetime.utcnow()
+    existing.updated_at = utc_now()
     
     db.commit()
-    db.refresh(existing)
+    invalidate_instrument_caches()
     return db_instrument_to_pydantic(existing)
 
 @app.delete("/api/instruments/{instrument_id}")
-async def delete_instrument(instrument_id: str, db: Session = Depends(get_db)):
+def delete_instrument(instrument_id: str, db: Session = Depends(get_db)):
     """Delete instrument and all related tasks"""
     existing = db.query(DBInstrument).filter(DBInstrument.id == instrument_id).first()
     if not existing:
@@ -544,24 +793,26 @@ async def delete_instrument(instrument_id: str, db: Session = Depends(get_db)):
     # Delete instrument (cascade will handle related tasks)
     db.delete(existing)
     db.commit()
+    invalidate_instrument_caches()
+    cache_clear("practice-total-time")
     
     return {"message": "Instrument deleted", "id": instrument_id}
 
 # Task definition endpoints
 @app.get("/api/task-definitions")
-async def get_task_definitions(db: Session = Depends(get_db)):
+def get_task_definitions(db: Session = Depends(get_db)):
     """Get all task definitions"""
     db_task_defs = db.query(DBTaskDefinition).all()
-    return [db_task_definition_to_pydantic(td) for td in db_task_defs]
+    return ORJSONResponse([db_task_definition_to_dict(td) for td in db_task_defs])
 
 @app.get("/api/task-definitions/instrument/{instrument_id}")
-async def get_task_definitions_by_instrument(instrument_id: str, db: Session = Depends(get_db)):
+def get_task_definitions_by_instrument(instrument_id: str, db: Session = Depends(get_db)):
     """Get task definitions for specific instrument"""
     db_task_defs = db.query(DBTaskDefinition).filter(DBTaskDefinition.instrument_id == instrument_id).all()
-    return [db_task_definition_to_pydantic(td) for td in db_task_defs]
+    return ORJSONResponse([db_task_definition_to_dict(td) for td in db_task_defs])
 
 @app.post("/api/task-definitions")
-async def create_task_definition(task_def: TaskDefinitionCreate, db: Session = Depends(get_db)):
+def create_task_definition(task_def: TaskDefinitionCreate, db: Session = Depends(get_db)):
     """Create a new task definition and generate occurrences"""
     # Verify instrument exists
     instrument = db.query(DBInstrument).filter(DBInstrument.id == task_def.instrument_id).first()
@@ -578,15 +829,15 @@ async def create_task_definition(task_def: TaskDefinitionCreate, db: Session = D
     )
     db.add(new_def)
     db.commit()
-    db.refresh(new_def)
     
     # Generate occurrences
     generate_task_occurrences(new_def, db)
     
+    cache_clear("analytics:")
     return db_task_definition_to_pydantic(new_def)
 
 @app.delete("/api/task-definitions/{task_def_id}")
-async def delete_task_definition(task_def_id: str, db: Session = Depends(get_db)):
+def delete_task_definition(task_def_id: str, db: Session = Depends(get_db)):
     """Delete task definition and its occurrences"""
     existing = db.query(DBTaskDefinition).filter(DBTaskDefinition.id == task_def_id).first()
     if not existing:
@@ -595,105 +846,75 @@ async def delete_task_definition(task_def_id: str, db: Session = Depends(get_db)
     # Cascade delete will handle task_occurrences
     db.delete(existing)
     db.commit()
+    cache_clear("analytics:")
     
     return {"message": "Task definition deleted", "id": task_def_id}
 
 # Practice Session Definition endpoints
 @app.get("/api/practice-session-definitions", response_model=List[PracticeSessionDefinition])
-async def get_practice_session_definitions(db: Session = Depends(get_db)):
+def get_practice_session_definitions(db: Session = Depends(get_db)):
     """Get all practice session definitions"""
-    db_defs = db.query(DBPracticeSessionDefinition).all()
-    return [db_practice_session_definition_to_pydantic(d) for d in db_defs]
+    return cached_json_response(
+        "practice-session-definitions", DEFINITIONS_CACHE_TTL,
+        lambda: [db_practice_session_definition_to_dict(d) for d in db.query(DBPracticeSessionDefinition).all()]
+    )
 
 # Task occurrence endpoints
 @app.get("/api/tasks")
-async def get_tasks(
+def get_tasks(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     instrument_id: Optional[str] = None,
     task_type: Optional[TaskType] = None,
     completed: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get practice sessions (legacy endpoint - returns PracticeSession data in TaskOccurrence format for compatibility)"""
     # Query PracticeSession instead of TaskOccurrence
-    query = db.query(DBPracticeSession)
+    # Core select of just the needed columns - plain rows, no ORM objects / identity map
+    stmt = select(*LEGACY_TASK_COLUMNS)
     
+    # Filter by start_time date instead of due_date, as a plain range on start_time so the index is used
+    # (same bounds and storage-format assumption as day_bounds)
     if start_date:
-        # Filter by start_time date instead of due_date
-        start_date_obj = date.fromisoformat(start_date)
-        query = query.filter(
-            func.date(DBPracticeSession.start_time) >= start_date_obj
+        stmt = stmt.where(
+            DBPracticeSession.start_time >= day_bounds(date.fromisoformat(start_date))["day_start"]
         )
     if end_date:
-        # Filter by start_time date instead of due_date
-        end_date_obj = date.fromisoformat(end_date)
-        query = query.filter(
-            func.date(DBPracticeSession.start_time) <= end_date_obj
+        stmt = stmt.where(
+            DBPracticeSession.start_time < day_bounds(date.fromisoformat(end_date))["day_end"]
         )
     if instrument_id:
-        query = query.filter(DBPracticeSession.instrument_id == instrument_id)
+        stmt = stmt.where(DBPracticeSession.instrument_id == instrument_id)
     if completed is not None:
-        query = query.filter(DBPracticeSession.completed == completed)
+        stmt = stmt.where(DBPracticeSession.completed == completed)
     
-    sessions = query.order_by(DBPracticeSession.start_time).all()
+    rows = db.execute(stmt.order_by(DBPracticeSession.start_time), execution_options={"yield_per": STREAM_BATCH_SIZE})
     
     # Convert PracticeSession to TaskOccurrence format for backward compatibility
-    # Get "Practice General" definition ID for mapping
-    practice_general = db.query(DBPracticeSessionDefinition).filter(
-        DBPracticeSessionDefinition.name == "Practice General"
-    ).first()
-    
-    result = []
-    for session in sessions:
-        # Extract date from start_time for due_date field (backward compatibility)
-        due_date_value = None
-        if session.start_time:
-            due_date_value = session.start_time.date().isoformat()
-        
-        # Convert to TaskOccurrence-like format
-        result.append({
-            "id": session.id,
-            "task_definition_id": "",  # Not applicable for PracticeSession
-            "instrument_id": session.instrument_id,
-            "due_date": due_date_value,
-            "task_type": "Practice",  # Default to Practice
-            "completed": session.completed,
-            "completed_at": session.completed_at.isoformat() if session.completed_at else None,
-            "notes": session.notes,
-            "photo_url": session.photo_url,
-            # Add new fields for frontend
-            "start_time": session.start_time.isoformat() if session.start_time else None,
-            "end_time": session.end_time.isoformat() if session.end_time else None,
-            "duration": session.duration,
-            "practice_session_definition_id": session.practice_session_definition_id
-        })
-    
-    return result
+    return stream_json_array(rows, practice_session_row_to_task_dict)
 
 @app.get("/api/practice-sessions")
-async def get_practice_sessions(
+def get_practice_sessions(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     instrument_id: Optional[str] = None,
     practice_session_definition_id: Optional[str] = None,
     completed: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get practice sessions with optional filters"""
     query = db.query(DBPracticeSession)
     
+    # Filter by start_time date instead of due_date, as a plain range on start_time so the index is used
+    # (same bounds and storage-format assumption as day_bounds)
     if start_date:
-        # Filter by start_time date instead of due_date
-        start_date_obj = date.fromisoformat(start_date)
         query = query.filter(
-            func.date(DBPracticeSession.start_time) >= start_date_obj
+            DBPracticeSession.start_time >= day_bounds(date.fromisoformat(start_date))["day_start"]
         )
     if end_date:
-        # Filter by start_time date instead of due_date
-        end_date_obj = date.fromisoformat(end_date)
         query = query.filter(
-            func.date(DBPracticeSession.start_time) <= end_date_obj
+            DBPracticeSession.start_time < day_bounds(date.fromisoformat(end_date))["day_end"]
         )
     if instrument_id:
         query = query.filter(DBPracticeSession.instrument_id == instrument_id)
@@ -702,11 +923,10 @@ async def get_practice_sessions(
     if completed is not None:
         query = query.filter(DBPracticeSession.completed == completed)
     
-    sessions = query.order_by(DBPracticeSession.start_time).all()
-    return [db_practice_session_to_pydantic(s) for s in sessions]
+    return stream_json_array(query.order_by(DBPracticeSession.start_time).yield_per(STREAM_BATCH_SIZE), db_practice_session_to_dict)
 
 @app.post("/api/practice-sessions", response_model=PracticeSession)
-async def create_practice_session(session: PracticeSessionCreate, db: Session = Depends(get_db)):
+def create_practice_session(session: PracticeSessionCreate, db: Session = Depends(get_db)):
     """Create a new practice session"""
     # Verify instrument exists
     instrument = db.query(DBInstrument).filter(DBInstrument.id == session.instrument_id).first()
@@ -724,14 +944,14 @@ async def create_practice_session(session: PracticeSessionCreate, db: Session =
     start_time = None
     if session.start_time:
         try:
-            start_time = datetime.fromisoformat(session.start_time.replace('Z', '+00:00'))
+            start_time = parse_utc_datetime(session.start_time)
         except (ValueError, AttributeError):
             start_time = None
     
     end_time = None
     if session.end_time:
         try:
-            end_time = datetime.fromisoformat(session.end_time.replace('Z', '+00:00'))
+            end_time = parse_utc_datetime(session.end_time)
         except (ValueError, AttributeError):
             end_time = None
     
@@ -749,41 +969,45 @@ async def create_practice_session(session: PracticeSessionCreate, db: Session =
     
     db.add(new_session)
     db.commit()
-    db.refresh(new_session)
+    cache_clear("practice-total-time")
     
     return db_practice_session_to_pydantic(new_session)
 
 @app.put("/api/practice-sessions/{session_id}", response_model=PracticeSession)
-async def update_practice_session(session_id: str, session: PracticeSessionCreate, db: Session = Depends(get_db)):
+def update_practice_session(session_id: str, session: PracticeSessionCreate, db: Session = Depends(get_db)):
     """Update an existing practice session"""
-    existing = db.query(DBPracticeSession).filter(DBPracticeSession.id == session_id).first()
-    if not existing:
+    # Load the session and verify the instrument and definition exist in one round-trip
+    row = db.execute(
+        select(
+            DBPracticeSession,
+            select(DBInstrument.id).where(DBInstrument.id == session.instrument_id).exists().label("instrument_ok"),
+            select(DBPracticeSessionDefinition.id).where(
+                DBPracticeSessionDefinition.id == session.practice_session_definition_id
+            ).exists().label("definition_ok")
+        ).where(DBPracticeSession.id == session_id)
+    ).one_or_none()
+    if row is None:
         raise HTTPException(status_code=404, detail="Practice session not found")
+    existing, instrument_ok, definition_ok = row
     
-    # Verify instrument exists
-    instrument = db.query(DBInstrument).filter(DBInstrument.id == session.instrument_id).first()
-    if not instrument:
+    if not instrument_ok:
         raise HTTPException(status_code=404, detail="Instrument not found")
     
-    # Verify practice session definition exists
-    practice_def = db.query(DBPracticeSessionDefinition).filter(
-        DBPracticeSessionDefinition.id == session.practice_session_definition_id
-    ).first()
-    if not practice_def:
+    if not definition_ok:
         raise HTTPException(status_code=404, detail="Practice session definition not found")
     
     # Parse start_time and end_time (due_date removed)
     start_time = None
     if session.start_time:
         try:
-            start_time = datetime.fromisoformat(session.start_time.replace('Z', '+00:00'))
+            start_time = parse_utc_datetime(session.start_time)
         except (ValueError, AttributeError):
             start_time = existing.start_time
     
     end_time = None
     if session.end_time:
         try:
-            end_time = datetime.fromisoformat(session.end_time.replace('Z', '+00:00'))
+            end_time = parse_utc_datetime(session.end_time)
         except (ValueError, AttributeError):
             end_time = existing.end_time
     
@@ -794,15 +1018,15 @@ async def update_practice_session(session_id: str, session: PracticeSessionCreat
     existing.end_time = end_time
     existing.duration = session.duration
     existing.notes = session.notes
-    existing.updated_at = datetime.utcnow()
+    existing.updated_at = utc_now()
     
     db.commit()
-    db.refresh(existing)
+    cache_clear("practice-total-time")
     
     return db_practice_session_to_pydantic(existing)
 
 @app.delete("/api/practice-sessions/{session_id}")
-async def delete_practice_session(session_id: str, db: Session = Depends(get_db)):
+def delete_practice_session(session_id: str, db: Session = Depends(get_db)):
     """Delete a practice session"""
     session = db.query(DBPracticeSession).filter(DBPracticeSession.id == session_id).first()
     if not session:
@@ -810,157 +1034,58 @@ async def delete_practice_session(session_id: str, db: Session = Depends(get_db)
     
     db.delete(session)
     db.commit()
+    cache_clear("practice-total-time")
     
     return {"message": "Practice session deleted", "id": session_id}
 
 @app.get("/api/practice-sessions/total-time")
-async def get_total_practice_time(db: Session = Depends(get_db)):
+def get_total_practice_time(db: Session = Depends(get_read_db)):
     """Calculate total practice time from all sessions in the database"""
-    from sqlalchemy import func
-    total = db.query(func.sum(DBPracticeSession.duration)).filter(
-        DBPracticeSession.duration.isnot(None)
-    ).scalar()
-    return {"total_time": int(total) if total else 0}
+    def build():
+        total = db.query(func.sum(DBPracticeSession.duration)).filter(
+            DBPracticeSession.duration.isnot(None)
+        ).scalar()
+        return {"total_time": int(total) if total else 0}
+    # Polled by the dashboard - the SUM is only recomputed after a practice session write
+    return cached_json_response("practice-total-time", PRACTICE_TIME_CACHE_TTL, build)
 
 @app.get("/api/tasks/date/{task_date}")
-async def get_tasks_by_date(task_date: str, db: Session = Depends(get_db)):
+def get_tasks_by_date(task_date: str, db: Session = Depends(get_read_db)):
     """Get all practice sessions for a specific date (legacy endpoint)"""
-    # Filter by start_time date instead of due_date
+    # Filter by start_time range (index seek) instead of due_date
     task_date_obj = date.fromisoformat(task_date)
-    sessions = db.query(DBPracticeSession).filter(
-        func.date(DBPracticeSession.start_time) == task_date_obj
-    ).all()
     # Convert to TaskOccurrence format for backward compatibility
-    result = []
-    for session in sessions:
-        # Extract date from start_time for due_date field (backward compatibility)
-        due_date_value = None
-        if session.start_time:
-            due_date_value = session.start_time.date().isoformat()
-        result.append({
-            "id": session.id,
-            "task_definition_id": "",
-            "instrument_id": session.instrument_id,
-            "due_date": due_date_value,
-            "task_type": "Practice",
-            "completed": session.completed,
-            "completed_at": session.completed_at.isoformat() if session.completed_at else None,
-            "notes": session.notes,
-            "photo_url": session.photo_url,
-            "start_time": session.start_time.isoformat() if session.start_time else None,
-            "end_time": session.end_time.isoformat() if session.end_time else None,
-            "duration": session.duration,
-            "practice_session_definition_id": session.practice_session_definition_id
-        })
-    return result
+    return ORJSONResponse(select_legacy_tasks(db, LEGACY_TASKS_ON_DAY, day_bounds(task_date_obj)))
 
 @app.get("/api/tasks/today")
-async def get_tasks_today(db: Session = Depends(get_db)):
+def get_tasks_today(db: Session = Depends(get_read_db)):
     """Get practice sessions for today (legacy endpoint)"""
     today = date.today()
-    # Filter by start_time date instead of due_date
-    sessions = db.query(DBPracticeSession).filter(
-        func.date(DBPracticeSession.start_time) == today,
-        DBPracticeSession.completed == False
-    ).all()
-    # Convert to TaskOccurrence format
-    result = []
-    for session in sessions:
-        # Extract date from start_time for due_date field (backward compatibility)
-        due_date_value = None
-        if session.start_time:
-            due_date_value = session.start_time.date().isoformat()
-        result.append({
-            "id": session.id,
-            "task_definition_id": "",
-            "instrument_id": session.instrument_id,
-            "due_date": due_date_value,
-            "task_type": "Practice",
-            "completed": session.completed,
-            "completed_at": session.completed_at.isoformat() if session.completed_at else None,
-            "notes": session.notes,
-            "photo_url": session.photo_url,
-            "start_time": session.start_time.isoformat() if session.start_time else None,
-            "end_time": session.end_time.isoformat() if session.end_time else None,
-            "duration": session.duration,
-            "practice_session_definition_id": session.practice_session_definition_id
-        })
-    return result
+    # Filter by start_time range (index seek) instead of due_date
+    return ORJSONResponse(select_legacy_tasks(db, LEGACY_OPEN_TASKS_ON_DAY, day_bounds(today)))
 
 @app.get("/api/tasks/tomorrow")
-async def get_tasks_tomorrow(db: Session = Depends(get_db)):
+def get_tasks_tomorrow(db: Session = Depends(get_read_db)):
     """Get practice sessions for tomorrow (legacy endpoint)"""
     tomorrow = date.today() + timedelta(days=1)
-    # Filter by start_time date instead of due_date
-    sessions = db.query(DBPracticeSession).filter(
-        func.date(DBPracticeSession.start_time) == tomorrow,
-        DBPracticeSession.completed == False
-    ).all()
-    # Convert to TaskOccurrence format
-    result = []
-    for session in sessions:
-        # Extract date from start_time for due_date field (backward compatibility)
-        due_date_value = None
-        if session.start_time:
-            due_date_value = session.start_time.date().isoformat()
-        result.append({
-            "id": session.id,
-            "task_definition_id": "",
-            "instrument_id": session.instrument_id,
-            "due_date": due_date_value,
-            "task_type": "Practice",
-            "completed": session.completed,
-            "completed_at": session.completed_at.isoformat() if session.completed_at else None,
-            "notes": session.notes,
-            "photo_url": session.photo_url,
-            "start_time": session.start_time.isoformat() if session.start_time else None,
-            "end_time": session.end_time.isoformat() if session.end_time else None,
-            "duration": session.duration,
-            "practice_session_definition_id": session.practice_session_definition_id
-        })
-    return result
+    # Filter by start_time range (index seek) instead of due_date
+    return ORJSONResponse(select_legacy_tasks(db, LEGACY_OPEN_TASKS_ON_DAY, day_bounds(tomorrow)))
 
 @app.get("/api/tasks/overdue")
-async def get_tasks_overdue(db: Session = Depends(get_db)):
+def get_tasks_overdue(db: Session = Depends(get_read_db)):
     """Get overdue practice sessions (legacy endpoint)"""
     today = date.today()
-    # Filter by start_time date instead of due_date
-    sessions = db.query(DBPracticeSession).filter(
-        func.date(DBPracticeSession.start_time) < today,
-        DBPracticeSession.completed == False
-    ).all()
-    # Convert to TaskOccurrence format
-    result = []
-    for session in sessions:
-        # Extract date from start_time for due_date field (backward compatibility)
-        due_date_value = None
-        if session.start_time:
-            due_date_value = session.start_time.date().isoformat()
-        result.append({
-            "id": session.id,
-            "task_definition_id": "",
-            "instrument_id": session.instrument_id,
-            "due_date": due_date_value,
-            "task_type": "Practice",
-            "completed": session.completed,
-            "completed_at": session.completed_at.isoformat() if session.completed_at else None,
-            "notes": session.notes,
-            "photo_url": session.photo_url,
-            "start_time": session.start_time.isoformat() if session.start_time else None,
-            "end_time": session.end_time.isoformat() if session.end_time else None,
-            "duration": session.duration,
-            "practice_session_definition_id": session.practice_session_definition_id
-        })
-    return result
+    # Filter by start_time range (index seek) instead of due_date
+    return ORJSONResponse(select_legacy_tasks(db, LEGACY_OPEN_TASKS_BEFORE_DAY, day_bounds(today)))
 
 @app.post("/api/tasks/{task_id}/complete")
-async def complete_task(task_id: str, completion: TaskCompletion, db: Session = Depends(get_db)):
+def complete_task(task_id: str, completion: TaskCompletion, db: Session = Depends(get_db)):
     """Mark a task as complete"""
     task = db.query(DBTaskOccurrence).filter(DBTaskOccurrence.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    now = datetime.utcnow()
+    now = utc_now()
     task.completed = True
     task.completed_at = now
     task.notes = completion.notes
@@ -978,41 +1103,37 @@ async def complete_task(task_id: str, completion: TaskCompletion, db: Session =
     )
     db.add(task_completion)
     db.commit()
-    db.refresh(task)
+    cache_clear("analytics:")
     
     return db_task_occurrence_to_pydantic(task)
 
 @app.put("/api/tasks/{task_id}/reschedule")
-async def reschedule_task(task_id: str, new_date: dict, db: Session = Depends(get_db)):
+def reschedule_task(task_id: str, new_date: RescheduleRequest, db: Session = Depends(get_db)):
     """Reschedule a practice session to a new due date (legacy endpoint)"""
     session = db.query(DBPracticeSession).filter(DBPracticeSession.id == task_id).first()
     if not session:
         raise HTTPException(status_code=404, detail="Practice session not found")
     
-    try:
-        # Update start_time with new date, preserving the time component
-        new_due_date = date.fromisoformat(new_date.get('due_date'))
-        if session.start_time:
-            # Preserve the time from existing start_time, only change the date
-            old_start = session.start_time
-            new_start_time = datetime.combine(new_due_date, old_start.time())
-            session.start_time = new_start_time
-            # Also update end_time if it exists to maintain duration
-            if session.end_time and session.duration:
-                new_end_time = datetime.combine(new_due_date, session.end_time.time())
-                session.end_time = new_end_time
-        else:
-            # If no start_time, set it to the new date at midnight
-            session.start_time = datetime.combine(new_due_date, datetime.min.time())
-        session.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(session)
-        return db_practice_session_to_pydantic(session)
-    except (ValueError, KeyError) as e:
-        raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
+    # Update start_time with new date, preserving the time component
+    new_due_date = new_date.due_date
+    if session.start_time:
+        # Preserve the time from existing start_time, only change the date
+        old_start = session.start_time
+        new_start_time = datetime.combine(new_due_date, old_start.time())
+        session.start_time = new_start_time
+        # Also update end_time if it exists to maintain duration
+        if session.end_time and session.duration:
+            new_end_time = datetime.combine(new_due_date, session.end_time.time())
+            session.end_time = new_end_time
+    else:
+        # If no start_time, set it to the new date at midnight
+        session.start_time = datetime.combine(new_due_date, datetime.min.time())
+    session.updated_at = utc_now()
+    db.commit()
+    return db_practice_session_to_pydantic(session)
 
 @app.delete("/api/tasks/{task_id}")
-async def delete_task_occurrence(task_id: str, db: Session = Depends(get_db)):
+def delete_task_occurrence(task_id: str, db: Session = Depends(get_db)):
     """Delete a single practice session (legacy endpoint - deletes from PracticeSession table)"""
     # Query PracticeSession instead of TaskOccurrence (matching GET /api/tasks behavior)
     session = db.query(DBPracticeSession).filter(DBPracticeSession.id == task_id).first()
@@ -1021,114 +1142,140 @@ async def delete_task_occurrence(task_id: str, db: Session = Depends(get_db)):
     
     db.delete(session)
     db.commit()
+    cache_clear("practice-total-time")
     
     return {"message": "Practice session deleted", "id": task_id}
 
 @app.post("/api/tasks/instrument/{instrument_id}/complete-all")
-async def complete_all_tasks_for_instrument(instrument_id: str, db: Session = Depends(get_db)):
+def complete_all_tasks_for_instrument(instrument_id: str, db: Session = Depends(get_db)):
     """Batch complete all due/overdue tasks for instrument"""
     today = date.today()
-    tasks = db.query(DBTaskOccurrence).filter(
+    now = utc_now()
+    columns = DBTaskOccurrence.__table__.columns
+    mark_completed = update(DBTaskOccurrence).where(
         DBTaskOccurrence.instrument_id == instrument_id,
         DBTaskOccurrence.due_date <= today,
         DBTaskOccurrence.completed == False
-    ).all()
-    
-    now = datetime.utcnow()
-    completed = []
+    ).values(completed=True, completed_at=now).execution_options(synchronize_session=False)
     
-    for task in tasks:
-        task.completed = True
-        task.completed_at = now
-        
-        # Create completion record
-        task_completion = DBTaskCompletion(
-            id=generate_uuid(),
-            task_occurrence_id=task.id,
-            instrument_id=instrument_id,
-            task_type=task.task_type,
-            completed_at=now,
-            notes=None,
-            photo_url=None
-        )
-        db.add(task_completion)
-        completed.append(task)
-        
+    if db.get_bind().dialect.update_returning:
+        # UPDATE ... RETURNING (SQLite 3.35+, Postgres) marks and returns the tasks in one statement
+        tasks = db.execute(mark_completed.returning(*columns)).all()
+    else:
+        # No RETURNING - pick the ids first, then mark and read back exactly those rows
+        task_ids = db.execute(select(DBTaskOccurrence.id).where(mark_completed.whereclause)).scalars().all()
+        db.execute(mark_completed.where(DBTaskOccurrence.id.in_(task_ids)))
+        tasks = db.execute(select(*columns).where(DBTaskOccurrence.id.in_(task_ids))).all()
+    
+    if tasks:
+        # One executemany INSERT for the completion records
+        db.execute(insert(DBTaskCompletion), [
+            {
+                "id": generate_uuid(),
+                "task_occurrence_id": task.id,
+                "instrument_id": instrument_id,
+                "task_type": task.task_type,
+                "completed_at": now,
+                "notes": None,
+                "photo_url": None
+            }
+            for task in tasks
+        ])
     db.commit()
-    for task in completed:
-        db.refresh(task)
+    cache_clear("analytics:")
     
     return {
-        "completed_count": len(completed),
-        "tasks": [db_task_occurrence_to_pydantic(t) for t in completed]
+        "completed_count": len(tasks),
+        "tasks": [db_task_occurrence_to_dict(t) for t in tasks]
     }
 
 # Analytics endpoints
 @app.get("/api/analytics/completion-rate")
-async def get_completion_rate(period: str = "monthly", db: Session = Depends(get_db)):  # weekly or monthly
+def get_completion_rate(period: Literal["weekly", "monthly"] = "monthly", db: Session = Depends(get_read_db)):
     """Get completion rate for period"""
-    if period == "weekly":
-        start_date = date.today() - timedelta(days=7)
-    else:
-        start_date = date.today() - timedelta(days=30)
-    
-    all_tasks = db.query(DBTaskOccurrence).filter(DBTaskOccurrence.due_date >= start_date).all()
-    completed_tasks = [t for t in all_tasks if t.completed]
-    
-    rate = (len(completed_tasks) / len(all_tasks) * 100) if all_tasks else 0
-    return {"period": period, "completion_rate": round(rate, 2), "total": len(all_tasks), "completed": len(completed_tasks)}
+    def build():
+        if period == "weekly":
+            start_date = date.today() - timedelta(days=7)
+        else:
+            start_date = date.today() - timedelta(days=30)
+        
+        total, completed = db.execute(
+            select(func.count(), func.coalesce(func.sum(case((DBTaskOccurrence.completed == True, 1), else_=0)), 0))
+            .where(DBTaskOccurrence.due_date >= start_date)
+        ).one()
+        
+        rate = (completed / total * 100) if total else 0
+        return {"period": period, "completion_rate": round(rate, 2), "total": total, "completed": completed}
+    return cached_analytics(f"completion-rate:{period}", build)
 
 @app.get("/api/analytics/streak")
-async def get_streak(db: Session = Depends(get_db)):
+def get_streak(db: Session = Depends(get_read_db)):
     """Get completion streak"""
-    return {"streak_days": get_completion_streak(db)}
+    def build():
+        return {"streak_days": get_completion_streak(db)}
+    return cached_analytics("streak", build)
 
 @app.get("/api/analytics/instrument-scores")
-async def get_instrument_scores(db: Session = Depends(get_db)):
+def get_instrument_scores(db: Session = Depends(get_read_db)):
     """Get maintenance score per instrument (last 30 days)"""
-    thirty_days_ago = date.today() - timedelta(days=30)
-    all_instruments = db.query(DBInstrument).all()
-    scores = []
-    
-    for instrument in all_instruments:
-        instr_tasks = db.query(DBTaskOccurrence).filter(
-            DBTaskOccurrence.instrument_id == instrument.id,
-            DBTaskOccurrence.due_date >= thirty_days_ago
-        ).all()
-        completed = [t for t in instr_tasks if t.completed]
-        score = (len(completed) / len(instr_tasks) * 100) if instr_tasks else 0
+    def build():
+        thirty_days_ago = date.today() - timedelta(days=30)
+        # Per-instrument (total, completed) counts in one GROUP BY instead of a query per instrument
+        counts = {
+            instrument_id: (total, completed)
+            for instrument_id, total, completed in db.execute(
+                select(
+                    DBTaskOccurrence.instrument_id,
+                    func.count(),
+                    func.sum(case((DBTaskOccurrence.completed == True, 1), else_=0))
+                )
+                .where(DBTaskOccurrence.due_date >= thirty_days_ago)
+                .group_by(DBTaskOccurrence.instrument_id)
+            )
+        }
+        scores = []
         
-        scores.append({
-            "instrument_id": instrument.id,
-            "instrument_name": instrument.name,
-            "score": round(score, 2),
-            "total_tasks": len(instr_tasks),
-            "completed_tasks": len(completed)
-        })
-    
-    return scores
+        for instrument_id, instrument_name in db.execute(select(DBInstrument.id, DBInstrument.name)):
+            total, completed = counts.get(instrument_id, (0, 0))
+            score = (completed / total * 100) if total else 0
+            
+            scores.append({
+                "instrument_id": instrument_id,
+                "instrument_name": instrument_name,
+                "score": round(score, 2),
+                "total_tasks": total,
+                "completed_tasks": completed
+            })
+        
+        return scores
+    return cached_analytics("instrument-scores", build)
 
 @app.get("/api/analytics/task-breakdown")
-async def get_task_breakdown(db: Session = Depends(get_db)):
+def get_task_breakdown(db: Session = Depends(get_read_db)):
     """Get task breakdown by type and instrument"""
-    breakdown = {
-        "by_type": {},
-        "by_instrument": {}
-    }
-    
-    all_tasks = db.query(DBTaskOccurrence).all()
-    all_instruments = {instr.id: instr.name for instr in db.query(DBInstrument).all()}
-    
-    for task in all_tasks:
-        # By type
-        task_type = task.task_type
-        breakdown["by_type"][task_type] = breakdown["by_type"].get(task_type, 0) + 1
+    def build():
+        breakdown = {
+            "by_type": {},
+            "by_instrument": {}
+        }
         
-        # By instrument
-        instr_name = all_instruments.get(task.instrument_id, "Unknown")
-        breakdown["by_instrument"][instr_name] = breakdown["by_instrument"].get(instr_name, 0) + 1
-    
-    return breakdown
+        # Counted in SQL per (type, instrument name) and folded into the two maps in one pass
+        instr_name = func.coalesce(DBInstrument.name, "Unknown")
+        rows = db.execute(
+            select(DBTaskOccurrence.task_type, instr_name, func.count())
+            .outerjoin(DBInstrument, DBInstrument.id == DBTaskOccurrence.instrument_id)
+            .group_by(DBTaskOccurrence.task_type, instr_name)
+        )
+        
+        for task_type, name, count in rows:
+            # By type
+            breakdown["by_type"][task_type] = breakdown["by_type"].get(task_type, 0) + count
+            
+            # By instrument
+            breakdown["by_instrument"][name] = breakdown["by_instrument"].get(name, 0) + count
+        
+        return breakdown
+    return cached_analytics("task-breakdown", build)
 
 # Instruments endpoint
 @app.get("/api/instruments")
@@ -1138,7 +1285,7 @@ async def get_instruments():
 
 # Authentication endpoints
 @app.post("/api/auth/signup", response_model=AuthResponse)
-async def signup(request: SignUpRequest, db: Session = Depends(get_db)):
+def signup(request: SignUpRequest, db: Session = Depends(get_db)):
     """Create a new user account"""
     # Check if email already exists
     existing = db.query(DBUserProfile).filter(DBUserProfile.email == request.email).first()
@@ -1156,7 +1303,6 @@ async def signup(request: SignUpRequest, db: Session = Depends(get_db)):
     )
     db.add(new_profile)
     db.commit()
-    db.refresh(new_profile)
     
     return AuthResponse(
         user_id=new_profile.id,
@@ -1166,7 +1312,7 @@ async def signup(request: SignUpRequest, db: Session = Depends(get_db)):
     )
 
 @app.post("/api/auth/signin", response_model=AuthResponse)
-async def signin(request: SignInRequest, db: Session = Depends(get_db)):
+def signin(request: SignInRequest, db: Session = Depends(get_db)):
     """Sign in with email and password"""
     # Find user by email
     user = db.query(DBUserProfile).filter(DBUserProfile.email == request.email).first()
@@ -1178,6 +1324,11 @@ async def signin(request: SignInRequest, db: Session = Depends(get_db)):
     if not user.password_hash or not verify_password(request.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
+    # Upgrade legacy bcrypt (or outdated Argon2) hashes now that the plain password is known
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = hash_password(request.password)
+        db.commit()
+    
     return AuthResponse(
         user_id=user.id,
         name=user.name,
@@ -1187,7 +1338,7 @@ async def signin(request: SignInRequest, db: Session = Depends(get_db)):
     )
 
 @app.get("/api/auth/current-user")
-async def get_current_user(user_id: Optional[str] = None, db: Session = Depends(get_db)):
+def get_current_user(user_id: Optional[str] = None, db: Session = Depends(get_db)):
     """Get current user profile by user_id"""
     if not user_id:
         raise HTTPException(status_code=401, detail="User ID required")
@@ -1205,17 +1356,14 @@ async def get_current_user(user_id: Optional[str] = None, db: Session = Depends(
 
 # Profile endpoints
 @app.post("/api/profile", response_model=UserProfile)
-async def create_profile(profile: UserProfileCreate, db: Session = Depends(get_db)):
+def create_profile(profile: UserProfileCreate, db: Session = Depends(get_db)):
     """Create a new user profile"""
     # Parse date_of_birth if provided
     dob = None
     if profile.date_of_birth:
         try:
             # Handle both YYYY-MM-DD format and ISO format
-            if len(profile.date_of_birth) == 10:  # YYYY-MM-DD format
-                dob = date.fromisoformat(profile.date_of_birth)
-            else:
-                dob = datetime.fromisoformat(profile.date_of_birth.replace('Z', '+00:00')).date()
+            dob = parse_iso_date(profile.date_of_birth)
         except Exception as e:
             print(f"Error parsing date_of_birth: {e}")
             dob = None
@@ -1239,11 +1387,10 @@ async def create_profile(profile: UserProfileCreate, db: Session = Depends(get_d
     )
     db.add(new_profile)
     db.commit()
-    db.refresh(new_profile)
     return db_user_profile_to_pydantic(new_profile)
 
 @app.get("/api/profile")
-async def get_profile(user_id: Optional[str] = Query(None), db: Session = Depends(get_db)):
+def get_profile(user_id: Optional[str] = Query(None), db: Session = Depends(get_db)):
     """Get user profile - for private app, returns first profile or creates default"""
     if user_id:
         profile = db.query(DBUserProfile).filter(DBUserProfile.id == user_id).first()
@@ -1263,12 +1410,11 @@ async def get_profile(user_id: Optional[str] = Query(None), db: Session = Depend
             )
             db.add(default_profile)
             db.commit()
-            db.refresh(default_profile)
             return db_user_profile_to_pydantic(default_profile)
         return db_user_profile_to_pydantic(profile)
 
 @app.put("/api/profile")
-async def update_profile(profile: UserProfileUpdate, user_id: Optional[str] = Query(None), db: Session = Depends(get_db)):
+def update_profile(profile: UserProfileUpdate, user_id: Optional[str] = Query(None), db: Session = Depends(get_db)):
     """Update profile - for private app, updates first profile if user_id not provided"""
     if user_id:
         existing = db.query(DBUserProfile).filter(DBUserProfile.id == user_id).first()
@@ -1287,33 +1433,29 @@ async def update_profile(profile: UserProfileUpdate, user_id: Optional[str] = Qu
             )
             db.add(existing)
             db.commit()
-            db.refresh(existing)
     
     # Update all fields - frontend sends all fields, so update them all
-    # Handle username (optional, not in profile form currently)
-    if profile.username is not None:
-        existing.username = profile.username.strip() if isinstance(profile.username, str) and profile.username.strip() else None
-    
-    # Update email
-    if profile.email is not None:
-        existing.email = profile.email.strip() if isinstance(profile.email, str) and profile.email.strip() else None
+    # Text fields: strip whitespace, empty strings become None
+    for field, clear_when_missing in PROFILE_TEXT_FIELDS:
+        value = getattr(profile, field)
+        if value is not None:
+            setattr(existing, field, value.strip() or None)
+        elif clear_when_missing:
+            setattr(existing, field, None)
     
     # Update name (required field)
     if profile.name is not None:
-        name_str = profile.name.strip() if isinstance(profile.name, str) else str(profile.name)
+        name_str = profile.name.strip()
         if name_str:  # Only update if non-empty
             existing.name = name_str
     
     # Update date_of_birth (handle empty string or None)
     if profile.date_of_birth is not None:
-        dob_str = profile.date_of_birth.strip() if isinstance(profile.date_of_birth, str) else str(profile.date_of_birth)
+        dob_str = profile.date_of_birth.strip()
         if dob_str:
             try:
                 # Handle both YYYY-MM-DD format and ISO format
-                if len(dob_str) == 10:  # YYYY-MM-DD format
-                    existing.date_of_birth = date.fromisoformat(dob_str)
-                else:
-                    existing.date_of_birth = datetime.fromisoformat(dob_str.replace('Z', '+00:00')).date()
+                existing.date_of_birth = parse_iso_date(dob_str)
             except Exception as e:
                 print(f"Error parsing date_of_birth '{profile.date_of_birth}': {e}")
                 # Keep existing date if parsing fails
@@ -1321,184 +1463,248 @@ async def update_profile(profile: UserProfileUpdate, user_id: Optional[str] = Qu
             # Empty string - clear the date
             existing.date_of_birth = None
     
-    # Update gender
-    if profile.gender is not None:
-        if isinstance(profile.gender, Gender):
-            existing.gender = profile.gender.value
-        elif isinstance(profile.gender, str):
-            gender_str = profile.gender.strip()
-            if gender_str and gender_str in [g.value for g in Gender]:
-                existing.gender = gender_str
-            else:
-                existing.gender = None
-        else:
-            existing.gender = None
-    else:
-        existing.gender = None
-    
-    # Update primary_instrument
-    if profile.primary_instrument is not None:
-        existing.primary_instrument = profile.primary_instrument.strip() if isinstance(profile.primary_instrument, str) and profile.primary_instrument.strip() else None
-    else:
-        existing.primary_instrument = None
-    
-    # Update age_commenced_playing (integer, allow None or 0)
-    existing.age_commenced_playing = profile.age_commenced_playing
-    
-    # Update secondary_instruments
-    if profile.secondary_instruments is not None:
-        existing.secondary_instruments = profile.secondary_instruments.strip() if isinstance(profile.secondary_instruments, str) and profile.secondary_instruments.strip() else None
-    else:
-        existing.secondary_instruments = None
-    
-    # Update daily_practice_hours (float, allow None or 0.0)
-    existing.daily_practice_hours = profile.daily_practice_hours
-    
-    # Update days_per_week_practising (integer, allow None or 0)
-    existing.days_per_week_practising = profile.days_per_week_practising
-    
-    # Update practice_routine_description
-    if profile.practice_routine_description is not None:
-        existing.practice_routine_description = profile.practice_routine_description.strip() if isinstance(profile.practice_routine_description, str) and profile.practice_routine_description.strip() else None
-    else:
-        existing.practice_routine_description = None
-    
-    # Update biography
-    if profile.biography is not None:
-        existing.biography = profile.biography.strip() if isinstance(profile.biography, str) and profile.biography.strip() else None
-    else:
-        existing.biography = None
+    # Update gender (unknown values are cleared)
+    gender_str = profile.gender.strip() if profile.gender is not None else None
+    existing.gender = gender_str if gender_str in GENDER_VALUES else None
     
-    # Update reminder_hours (integer, default 24)
-    if profile.reminder_hours is not None:
-        existing.reminder_hours = profile.reminder_hours
-    # If None, keep existing value (don't override with default)
+    # Numeric fields are always assigned (allow None or 0)
+    for field in PROFILE_SCALAR_FIELDS:
+        setattr(existing, field, getattr(profile, field))
     
-    # Update notifications_enabled (boolean)
-    if profile.notifications_enabled is not None:
-        existing.notifications_enabled = profile.notifications_enabled
+    # Settings: if None, keep existing value (don't override with default)
+    for field in PROFILE_SETTING_FIELDS:
+        value = getattr(profile, field)
+        if value is not None:
+            setattr(existing, field, value)
     
-    existing.updated_at = datetime.utcnow()
+    existing.updated_at = utc_now()
     db.commit()
-    db.refresh(existing)
     return db_user_profile_to_pydantic(existing)
 
 # Export endpoints
+# iCalendar content lines end in CRLF (RFC 5545)
+ICS_HEADER = "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Practice Tracker//EN\r\n"
+ICS_EVENT_TEMPLATE = (
+    "BEGIN:VEVENT\r\n"
+    "DTSTART;VALUE=DATE:{d}\r\n"
+    "SUMMARY:{t} - {n}\r\n"
+    "DESCRIPTION:Practice session for {n}\r\n"
+    "END:VEVENT\r\n"
+)
+ICS_FOOTER = "END:VCALENDAR\r\n"
+
+def iter_ics(rows):
+    """Render (due_date, task_type, instrument_name) rows as an ICS calendar, one chunk of events at a time"""
+    rows_iter = iter(rows)
+    yield ICS_HEADER
+    while True:
+        batch = list(islice(rows_iter, STREAM_BATCH_SIZE))
+        if not batch:
+            break
+        # Pre-formatted events joined once per chunk (avoids quadratic string concatenation);
+        # isoformat() minus dashes gives the YYYYMMDD form ~4x faster than strftime
+        yield "".join([
+            ICS_EVENT_TEMPLATE.format(d=due_date.isoformat().replace("-", ""), t=task_type, n=instr_name)
+            for due_date, task_type, instr_name in batch
+        ])
+    yield ICS_FOOTER
+
+def iter_csv(rows):
+    """Render (due_date, instrument_name, task_type, completed, completed_at, notes) rows as CSV, one chunk at a time"""
+    rows_iter = iter(rows)
+    output = StringIO()
+    writer = csv.writer(output)
+    
+    writer.writerow(["Date", "Instrument", "Task Type", "Completed", "Completed At", "Notes"])
+    while True:
+        writer.writerows([
+            (
+                due_date.isoformat(),
+                instr_name,
+                task_type,
+                "Yes" if completed else "No",
+                completed_at.isoformat() if completed_at else "",
+                notes or ""
+            )
+            for due_date, instr_name, task_type, completed, completed_at, notes in islice(rows_iter, STREAM_BATCH_SIZE)
+        ])
+        chunk = output.getvalue()
+        if not chunk:
+            break
+        yield chunk
+        output.seek(0)
+        output.truncate()
+
+def select_ics_rows(db: Session, start_date: Optional[str], end_date: Optional[str],
+                    instrument_id: Optional[str], task_type: Optional[TaskType]):
+    """Stream (due_date, task_type, instrument_name) rows for the ICS export"""
+    # Instrument name resolved in the same query (outer join keeps occurrences of missing instruments)
+    query = select(
+        DBTaskOccurrence.due_date, DBTaskOccurrence.task_type, func.coalesce(DBInstrument.name, "Unknown")
+    ).outerjoin(DBInstrument, DBInstrument.id == DBTaskOccurrence.instrument_id)
+    
+    if start_date:
+        query = query.where(DBTaskOccurrence.due_date >= date.fromisoformat(start_date))
+    if end_date:
+        query = query.where(DBTaskOccurrence.due_date <= date.fromisoformat(end_date))
+    if instrument_id:
+        query = query.where(DBTaskOccurrence.instrument_id == instrument_id)
+    if task_type:
+        query = query.where(DBTaskOccurrence.task_type == task_type)
+    
+    return db.execute(query, execution_options={"yield_per": STREAM_BATCH_SIZE})
+
+def iter_csv_rows(db: Session):
+    """Yield (due_date, instrument_name, task_type, completed, completed_at, notes) tuples for the CSV export"""
+    query = select(
+        DBTaskOccurrence.due_date, DBTaskOccurrence.instrument_id, DBTaskOccurrence.task_type,
+        DBTaskOccurrence.completed, DBTaskOccurrence.completed_at, DBTaskOccurrence.notes
+    ).order_by(DBTaskOccurrence.due_date)
+    all_instruments = get_instrument_name_map(db)
+    
+    for due_date, instr_id, task_type, completed, completed_at, notes in db.execute(
+        query, execution_options={"yield_per": STREAM_BATCH_SIZE}
+    ):
+        yield due_date, all_instruments.get(instr_id, "Unknown"), task_type, completed, completed_at, notes
+
+# Pretty-printed like the old json.dumps(indent=2) backup; naive datetimes (never emitted by the
+# *_to_dict helpers, which pre-format them) would be tagged as UTC
+BACKUP_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC
+
+def iter_backup_json(db: Session):
+    """Yield the JSON backup document table by table, byte-identical to orjson.dumps(backup, OPT_INDENT_2)"""
+    yield b'{\n  "export_date": ' + orjson.dumps(datetime.now(_UTC).isoformat())
+    for key, model, to_dict in (
+        ("instruments", DBInstrument, db_instrument_to_dict),
+        ("task_definitions", DBTaskDefinition, db_task_definition_to_dict),
+        ("task_occurrences", DBTaskOccurrence, db_task_occurrence_to_dict),
+        ("task_completions", DBTaskCompletion, db_task_completion_to_dict)
+    ):
+        yield b',\n  "' + key.encode() + b'": ['
+        separator = b""
+        for batch in db.execute(select(model).execution_options(yield_per=STREAM_BATCH_SIZE)).scalars().partitions():
+            # Each row is dumped with indentation, then shifted to its nesting depth
+            yield separator + b",".join(
+                b"\n    " + orjson.dumps(to_dict(row), option=BACKUP_JSON_OPTIONS).replace(b"\n", b"\n    ") for row in batch
+            )
+            separator = b","
+        yield b"\n  ]" if separator else b"]"
+    user_profile = db.query(DBUserProfile).first()
+    profile = db_user_profile_to_pydantic(user_profile).model_dump() if user_profile else None
+    yield b',\n  "user_profile": ' + orjson.dumps(profile, option=BACKUP_JSON_OPTIONS).replace(b"\n", b"\n  ") + b"\n}"
+
+# Exports are streamed from sync generators: Starlette iterates them in its threadpool, so
+# rendering never blocks the event loop and memory stays at one chunk of rows
 @app.get("/api/export/ics")
-async def export_ics(
+def export_ics(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     instrument_id: Optional[str] = None,
     task_type: Optional[TaskType] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Export tasks as ICS calendar file"""
-    query = db.query(DBTaskOccurrence)
-    
-    if start_date:
-        query = query.filter(DBTaskOccurrence.due_date >= date.fromisoformat(start_date))
-    if end_date:
-        query = query.filter(DBTaskOccurrence.due_date <= date.fromisoformat(end_date))
-    if instrument_id:
-        query = query.filter(DBTaskOccurrence.instrument_id == instrument_id)
-    if task_type:
-        query = query.filter(DBTaskOccurrence.task_type == task_type)
-    
-    tasks = query.all()
-    all_instruments = {instr.id: instr.name for instr in db.query(DBInstrument).all()}
-    
-    ics_content = "BEGIN:VCALENDAR\nVERSION:2.0\nPRODID:-//Practice Tracker//EN\n"
-    
-    for task in tasks:
-        instr_name = all_instruments.get(task.instrument_id, "Unknown")
-        due_date_str = task.due_date.isoformat().replace("-", "")
-        
-        ics_content += f"""BEGIN:VEVENT
-DTSTART;VALUE=DATE:{due_date_str}
-SUMMARY:{task.task_type} - {instr_name}
-DESCRIPTION:Practice session for {instr_name}
-END:VEVENT
-"""
-    
-    ics_content += "END:VCALENDAR\n"
-    
-    return Response(content=ics_content, media_type="text/calendar",
-                   headers={"Content-Disposition": "attachment; filename=tasks.ics"})
+    rows = select_ics_rows(db, start_date, end_date, instrument_id, task_type)
+    return StreamingResponse(iter_ics(rows), media_type="text/calendar",
+                             headers={"Content-Disposition": "attachment; filename=tasks.ics"})
 
 @app.get("/api/export/csv")
-async def export_csv(db: Session = Depends(get_db)):
+def export_csv(db: Session = Depends(get_read_db)):
     """Export task history as CSV"""
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    writer.writerow(["Date", "Instrument", "Task Type", "Completed", "Completed At", "Notes"])
-    
-    tasks = db.query(DBTaskOccurrence).order_by(DBTaskOccurrence.due_date).all()
-    all_instruments = {instr.id: instr.name for instr in db.query(DBInstrument).all()}
-    
-    for task in tasks:
-        instr_name = all_instruments.get(task.instrument_id, "Unknown")
-        
-        writer.writerow([
-            task.due_date.isoformat(),
-            instr_name,
-            task.task_type,
-            "Yes" if task.completed else "No",
-            task.completed_at.isoformat() if task.completed_at else "",
-            task.notes or ""
-        ])
-    
-    return Response(content=output.getvalue(), media_type="text/csv",
-                   headers={"Content-Disposition": "attachment; filename=tasks.csv"})
+    return StreamingResponse(iter_csv(iter_csv_rows(db)), media_type="text/csv",
+                             headers={"Content-Disposition": "attachment; filename=tasks.csv"})
 
 @app.get("/api/export/json")
-async def export_json(db: Session = Depends(get_db)):
+def export_json(db: Session = Depends(get_read_db)):
     """Export full backup as JSON"""
-    instruments = db.query(DBInstrument).all()
-    task_definitions = db.query(DBTaskDefinition).all()
-    task_occurrences = db.query(DBTaskOccurrence).all()
-    task_completions = db.query(DBTaskCompletion).all()
-    user_profile = db.query(DBUserProfile).first()
-    
-    # Convert to dict format
-    backup = {
-        "export_date": datetime.utcnow().isoformat(),
-        "instruments": [db_instrument_to_pydantic(instr).dict() for instr in instruments],
-        "task_definitions": [db_task_definition_to_pydantic(td).dict() for td in task_definitions],
-        "task_occurrences": [db_task_occurrence_to_pydantic(to).dict() for to in task_occurrences],
-        "task_completions": [{
-            "id": tc.id,
-            "task_occurrence_id": tc.task_occurrence_id,
-            "instrument_id": tc.instrument_id,
-            "task_type": tc.task_type,
-            "completed_at": tc.completed_at.isoformat() if tc.completed_at else None,
-            "notes": tc.notes,
-            "photo_url": tc.photo_url
-        } for tc in task_completions],
-        "user_profile": db_user_profile_to_pydantic(user_profile).dict() if user_profile else None
-    }
-    
-    return Response(content=json.dumps(backup, indent=2, default=str), media_type="application/json",
-                   headers={"Content-Disposition": "attachment; filename=backup.json"})
+    return StreamingResponse(iter_backup_json(db), media_type="application/json",
+                             headers={"Content-Disposition": "attachment; filename=backup.json"})
 
 @app.post("/api/data/clear")
-async def clear_all_data(confirm: bool = False, db: Session = Depends(get_db)):
+def clear_all_data(confirm: bool = False, db: Session = Depends(get_db)):
     """Clear all data (requires confirmation)"""
     if not confirm:
         raise HTTPException(status_code=400, detail="Confirmation required")
     
-    # Delete all records (cascade will handle relationships)
-    db.query(DBTaskCompletion).delete()
-    db.query(DBTaskOccurrence).delete()
-    db.query(DBTaskDefinition).delete()
-    db.query(DBInstrument).delete()
+    # Runs in the request (not a background task) so a failed delete reaches the caller as an error
+    # Delete all records in FK order with plain DELETEs (no per-row identity map sync), one transaction
+    # (PracticeSessionDefinition rows are shared session types, not per-instrument data, and are kept)
+    for model in (DBTaskCompletion, DBTaskOccurrence, DBTaskDefinition, DBPracticeSession, DBInstrument):
+        db.execute(delete(model).execution_options(synchronize_session=False))
     # Keep user profile or delete it too? Let's keep it for now
     # db.query(DBUserProfile).delete()
     
     db.commit()
+    invalidate_instrument_caches()
+    cache_clear("practice-total-time")
     
     return {"message": "All data cleared"}
 
+# Batch endpoint
+@app.post("/api/batch", response_model=List[BatchResult])
+async def batch(items: List[BatchItem], db: Session = Depends(get_db)):
+    """Run several API calls in one round trip (e.g. profile + instruments + tasks on startup), sharing one database session"""
+    return [await dispatch_batch_item(item, db) for item in items]
+
+# Static routes callable from /api/batch, first registration wins (same as FastAPI's routing)
+BATCH_ENDPOINTS = {}
+for route in app.routes:
+    if isinstance(route, APIRoute) and "{" not in route.path and route.path != "/api/batch":
+        for method in route.methods:
+            BATCH_ENDPOINTS.setdefault(
+                (method, route.path), (route.endpoint, inspect.signature(route.endpoint), route.status_code or 200)
+            )
+
+@lru_cache(maxsize=None)
+def batch_type_adapter(annotation) -> TypeAdapter:
+    """Cached TypeAdapter used to coerce batch query string values"""
+    return TypeAdapter(annotation)
+
+async def dispatch_batch_item(item: BatchItem, db: Session) -> dict:
+    """Call the endpoint for a single batch item directly (no HTTP round trip)"""
+    url = urlsplit(item.path)
+    target = BATCH_ENDPOINTS.get((item.method.upper(), url.path))
+    if not target:
+        return {"status": 404, "body": {"detail": "Not Found"}}
+    endpoint, signature, status_code = target
+    params = dict(parse_qsl(url.query))
+    
+    kwargs = {}
+    try:
+        for name, param in signature.parameters.items():
+            if name == "db":
+                kwargs[name] = db
+            elif isinstance(param.annotation, type) and issubclass(param.annotation, BaseModel):
+                kwargs[name] = param.annotation(**(item.body or {}))
+            elif name in params:
+                kwargs[name] = batch_type_adapter(param.annotation).validate_python(params[name])
+            elif param.default is inspect.Parameter.empty:
+                return {"status": 422, "body": {"detail": f"Missing parameter: {name}"}}
+            else:
+                # Query(None) style defaults hold the real default on the FieldInfo
+                kwargs[name] = param.default.default if isinstance(param.default, FieldInfo) else param.default
+    except ValidationError as e:
+        return {"status": 422, "body": {"detail": json.loads(e.json())}}
+    
+    try:
+        if inspect.iscoroutinefunction(endpoint):
+            result = await endpoint(**kwargs)
+        else:
+            result = await run_in_threadpool(endpoint, **kwargs)
+    except HTTPException as e:
+        await run_in_threadpool(db.rollback)  # Sync session - keep its I/O off the event loop
+        return {"status": e.status_code, "body": {"detail": e.detail}}
+    if isinstance(result, Response):
+        # List endpoints return pre-serialized (possibly streamed) bodies
+        if isinstance(result, StreamingResponse):
+            raw = b"".join([chunk if isinstance(chunk, bytes) else chunk.encode() async for chunk in result.body_iterator])
+        else:
+            raw = result.body
+        body = orjson.loads(raw) if result.media_type == "application/json" else raw.decode()
+        return {"status": result.status_code, "body": body}
+    # Same status the route would send over HTTP (its declared status_code, 200 by default)
+    return {"status": status_code, "body": jsonable_encoder(result)}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
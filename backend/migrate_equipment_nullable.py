@@ -6,6 +6,7 @@ Run this once to update existing database
 import sqlite3
 import os
 from pathlib import Path
+from migration_utils import tune_connection, connect_read_only
 
 # Database file location
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./practice_tracker.db")
@@ -19,12 +20,24 @@ if not os.path.exists(db_path):
 
 print(f"Migrating database: {db_path}")
 
+# Check if column is already nullable on a read-only connection - re-runs never take a write lock
+ro_conn = connect_read_only(db_path)
+try:
+    user_profile_column = next(
+        (row for row in ro_conn.execute("PRAGMA table_info(Equipment)") if row[1] == "user_profile_id"), None
+    )
+finally:
+    ro_conn.close()
+if user_profile_column is not None and user_profile_column[3] == 0:
+    print("✓ Equipment.user_profile_id is already nullable - no migration needed")
+    exit(0)
+
 conn = sqlite3.connect(db_path)
+tune_connection(conn)
 cursor = conn.cursor()
 
 try:
-    # Check if column is already nullable (SQLite doesn't support ALTER COLUMN directly)
-    # We need to recreate the table
+    # SQLite doesn't support ALTER COLUMN directly, so we need to recreate the table
     
     # Step 1: Create new table with nullable user_profile_id
     cursor.execute("""
@@ -6,6 +6,7 @@ Run this once to update existing database
 import sqlite3
 import os
 from pathlib import Path
+from migration_utils import connect_read_only
 
 # Database file location
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./practice_tracker.db")
@@ -19,121 +20,153 @@ if not os.path.exists(db_path):
 
 print(f"Migrating database: {db_path}")
 
+# Check if Equipment table exists on a read-only connection - re-runs never take a write lock
+ro_conn = connect_read_only(db_path)
+try:
+    equipment_exists = ro_conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='Equipment'"
+    ).fetchone() is not None
+finally:
+    ro_conn.close()
+
+if not equipment_exists:
+    print("Equipment table doesn't exist yet - no migration needed")
+    print("Database will be created with correct schema on next startup")
+    exit(0)
+
 conn = sqlite3.connect(db_path)
 cursor = conn.cursor()
+original_journal_mode = None
 
 try:
-    # Check if Equipment table exists
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='Equipment'")
-    equipment_exists = cursor.fetchone() is not None
-    
-    if not equipment_exists:
-        print("Equipment table doesn't exist yet - no migration needed")
-        print("Database will be created with correct schema on next startup")
-        exit(0)
+    # Bulk-migration settings: no per-row FK checks or fsyncs, rollback journal kept in memory
+    # (set here instead of via tune_connection, which would switch the file to WAL first).
+    # FK/sync settings are per-connection; the journal mode persists, so the file's own mode
+    # is read before anything changes it and restored below
+    cursor.execute("PRAGMA journal_mode")
+    original_journal_mode = cursor.fetchone()[0]
+    cursor.execute("PRAGMA foreign_keys=OFF")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    # All steps run in one transaction, holding the write lock from the start
+    cursor.execute("BEGIN IMMEDIATE")
+    # Indexes are built once at the end, after all table copies
+    deferred_indexes = ["CREATE INDEX IF NOT EXISTS ix_Instrument_id ON Instrument(id)"]
     
     # Step 1: Rename Equipment table to Instrument
     print("Step 1: Renaming Equipment table to Instrument...")
     cursor.execute("ALTER TABLE Equipment RENAME TO Instrument")
     
-    # Step 2: Update foreign key columns in TaskDefinitions
-    print("Step 2: Updating TaskDefinitions table...")
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='TaskDefinitions'")
-    if cursor.fetchone():
-        # Create new table with instrument_id
-        cursor.execute("""
-            CREATE TABLE TaskDefinitions_new (
-                id TEXT PRIMARY KEY,
-                instrument_id TEXT NOT NULL,
-                task_type TEXT NOT NULL,
-                frequency_type TEXT NOT NULL,
-                frequency_value INTEGER NOT NULL,
-                start_date DATE NOT NULL,
-                created_at DATETIME,
-                FOREIGN KEY (instrument_id) REFERENCES Instrument(id)
-            )
-        """)
+    # SQLite 3.25+ renames columns in place (a catalog-only change that also keeps indexes and
+    # foreign keys); older versions have to rebuild each table and copy every row
+    if sqlite3.sqlite_version_info >= (3, 25, 0):
+        for step, table in enumerate(("TaskDefinitions", "TaskOccurrences", "TaskCompletions"), start=2):
+            print(f"Step {step}: Updating {table} table...")
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table,))
+            if cursor.fetchone():
+                cursor.execute(f"ALTER TABLE {table} RENAME COLUMN equipment_id TO instrument_id")
+                print(f"  ✓ {table}.equipment_id → instrument_id")
+    else:
+        # Step 2: Update foreign key columns in TaskDefinitions
+        print("Step 2: Updating TaskDefinitions table...")
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='TaskDefinitions'")
+        if cursor.fetchone():
+            # Create new table with instrument_id
+            cursor.execute("""
+                CREATE TABLE TaskDefinitions_new (
+                    id TEXT PRIMARY KEY,
+                    instrument_id TEXT NOT NULL,
+                    task_type TEXT NOT NULL,
+                    frequency_type TEXT NOT NULL,
+                    frequency_value INTEGER NOT NULL,
+                    start_date DATE NOT NULL,
+                    created_at DATETIME,
+                    FOREIGN KEY (instrument_id) REFERENCES Instrument(id)
+                )
+            """)
+            
+            # Copy data, renaming equipment_id to instrument_id
+            cursor.execute("""
+                INSERT INTO TaskDefinitions_new 
+                SELECT id, equipment_id, task_type, frequency_type, frequency_value, start_date, created_at
+                FROM TaskDefinitions
+            """)
+            
+            # Drop old table and rename new one
+            cursor.execute("DROP TABLE TaskDefinitions")
+            cursor.execute("ALTER TABLE TaskDefinitions_new RENAME TO TaskDefinitions")
+            print("  ✓ TaskDefinitions.equipment_id → instrument_id")
         
-        # Copy data, renaming equipment_id to instrument_id
-        cursor.execute("""
-            INSERT INTO TaskDefinitions_new 
-            SELECT id, equipment_id, task_type, frequency_type, frequency_value, start_date, created_at
-            FROM TaskDefinitions
-        """)
+        # Step 3: Update foreign key columns in TaskOccurrences
+        print("Step 3: Updating TaskOccurrences table...")
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='TaskOccurrences'")
+        if cursor.fetchone():
+            # Create new table with instrument_id
+            cursor.execute("""
+                CREATE TABLE TaskOccurrences_new (
+                    id TEXT PRIMARY KEY,
+                    task_definition_id TEXT NOT NULL,
+                    instrument_id TEXT NOT NULL,
+                    due_date DATE NOT NULL,
+                    task_type TEXT NOT NULL,
+                    completed BOOLEAN DEFAULT 0,
+                    completed_at DATETIME,
+                    notes TEXT,
+                    photo_url TEXT,
+                    FOREIGN KEY (task_definition_id) REFERENCES TaskDefinitions(id),
+                    FOREIGN KEY (instrument_id) REFERENCES Instrument(id)
+                )
+            """)
+            
+            # Copy data, renaming equipment_id to instrument_id
+            cursor.execute("""
+                INSERT INTO TaskOccurrences_new 
+                SELECT id, task_definition_id, equipment_id, due_date, task_type, completed, completed_at, notes, photo_url
+                FROM TaskOccurrences
+            """)
+            
+            # Drop old table and rename new one
+            cursor.execute("DROP TABLE TaskOccurrences")
+            cursor.execute("ALTER TABLE TaskOccurrences_new RENAME TO TaskOccurrences")
+            deferred_indexes.append("CREATE INDEX IF NOT EXISTS ix_TaskOccurrences_due_date ON TaskOccurrences(due_date)")
+            print("  ✓ TaskOccurrences.equipment_id → instrument_id")
         
-        # Drop old table and rename new one
-        cursor.execute("DROP TABLE TaskDefinitions")
-        cursor.execute("ALTER TABLE TaskDefinitions_new RENAME TO TaskDefinitions")
-        print("  ✓ TaskDefinitions.equipment_id → instrument_id")
+        # Step 4: Update foreign key columns in TaskCompletions
+        print("Step 4: Updating TaskCompletions table...")
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='TaskCompletions'")
+        if cursor.fetchone():
+            # Create new table with instrument_id
+            cursor.execute("""
+                CREATE TABLE TaskCompletions_new (
+                    id TEXT PRIMARY KEY,
+                    task_occurrence_id TEXT NOT NULL,
+                    instrument_id TEXT NOT NULL,
+                    task_type TEXT NOT NULL,
+                    completed_at DATETIME NOT NULL,
+                    notes TEXT,
+                    photo_url TEXT,
+                    FOREIGN KEY (task_occurrence_id) REFERENCES TaskOccurrences(id)
+                )
+            """)
+            
+            # Copy data, renaming equipment_id to instrument_id
+            cursor.execute("""
+                INSERT INTO TaskCompletions_new 
+                SELECT id, task_occurrence_id, equipment_id, task_type, completed_at, notes, photo_url
+                FROM TaskCompletions
+            """)
+            
+            # Drop old table and rename new one
+            cursor.execute("DROP TABLE TaskCompletions")
+            cursor.execute("ALTER TABLE TaskCompletions_new RENAME TO TaskCompletions")
+            print("  ✓ TaskCompletions.equipment_id → instrument_id")
     
-    # Step 3: Update foreign key columns in TaskOccurrences
-    print("Step 3: Updating TaskOccurrences table...")
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='TaskOccurrences'")
-    if cursor.fetchone():
-        # Create new table with instrument_id
-        cursor.execute("""
-            CREATE TABLE TaskOccurrences_new (
-                id TEXT PRIMARY KEY,
-                task_definition_id TEXT NOT NULL,
-                instrument_id TEXT NOT NULL,
-                due_date DATE NOT NULL,
-                task_type TEXT NOT NULL,
-                completed BOOLEAN DEFAULT 0,
-                completed_at DATETIME,
-                notes TEXT,
-                photo_url TEXT,
-                FOREIGN KEY (task_definition_id) REFERENCES TaskDefinitions(id),
-                FOREIGN KEY (instrument_id) REFERENCES Instrument(id)
-            )
-        """)
-        
-        # Copy data, renaming equipment_id to instrument_id
-        cursor.execute("""
-            INSERT INTO TaskOccurrences_new 
-            SELECT id, task_definition_id, equipment_id, due_date, task_type, completed, completed_at, notes, photo_url
-            FROM TaskOccurrences
-        """)
-        
-        # Drop old table and rename new one
-        cursor.execute("DROP TABLE TaskOccurrences")
-        cursor.execute("ALTER TABLE TaskOccurrences_new RENAME TO TaskOccurrences")
-        
-        # Recreate index
-        cursor.execute("CREATE INDEX IF NOT EXISTS ix_TaskOccurrences_due_date ON TaskOccurrences(due_date)")
-        print("  ✓ TaskOccurrences.equipment_id → instrument_id")
-    
-    # Step 4: Update foreign key columns in TaskCompletions
-    print("Step 4: Updating TaskCompletions table...")
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='TaskCompletions'")
-    if cursor.fetchone():
-        # Create new table with instrument_id
-        cursor.execute("""
-            CREATE TABLE TaskCompletions_new (
-                id TEXT PRIMARY KEY,
-                task_occurrence_id TEXT NOT NULL,
-                instrument_id TEXT NOT NULL,
-                task_type TEXT NOT NULL,
-                completed_at DATETIME NOT NULL,
-                notes TEXT,
-                photo_url TEXT,
-                FOREIGN KEY (task_occurrence_id) REFERENCES TaskOccurrences(id)
-            )
-        """)
-        
-        # Copy data, renaming equipment_id to instrument_id
-        cursor.execute("""
-            INSERT INTO TaskCompletions_new 
-            SELECT id, task_occurrence_id, equipment_id, task_type, completed_at, notes, photo_url
-            FROM TaskCompletions
-        """)
-        
-        # Drop old table and rename new one
-        cursor.execute("DROP TABLE TaskCompletions")
-        cursor.execute("ALTER TABLE TaskCompletions_new RENAME TO TaskCompletions")
-        print("  ✓ TaskCompletions.equipment_id → instrument_id")
+    # Step 5: Create indexes (Instrument, plus any dropped by a table rebuild)
+    for create_index in deferred_indexes:
+        cursor.execute(create_index)
     
-    # Step 5: Recreate indexes for Instrument table
-    cursor.execute("CREATE INDEX IF NOT EXISTS ix_Instrument_id ON Instrument(id)")
+    # Refresh planner statistics for the renamed/rebuilt tables and their new indexes
+    cursor.execute("ANALYZE")
     
     conn.commit()
     print("✓ Migration completed successfully")
@@ -145,5 +178,8 @@ except sqlite3.OperationalError as e:
     conn.rollback()
     raise
 finally:
+    if original_journal_mode and not conn.in_transaction:
+        conn.execute(f"PRAGMA journal_mode={original_journal_mode}")
+    conn.execute("PRAGMA optimize")
     conn.close()
 
@@ -10,11 +10,29 @@ This script will:
 import sqlite3
 import os
 from pathlib import Path
+from migration_utils import tune_connection, connect_read_only
 
 # Database path
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./practice_tracker.db")
 db_path = DATABASE_URL.replace("sqlite:///", "")
 
+# Rows deleted per transaction - keeps each write lock and journal small on large tables
+CHUNK_SIZE = 1000
+
+def delete_non_practice(cursor, table):
+    """Delete non-Practice rows from table in CHUNK_SIZE batches, committing each batch"""
+    deleted = 0
+    while True:
+        cursor.execute(f"""
+            DELETE FROM {table} WHERE rowid IN (
+                SELECT rowid FROM {table} WHERE task_type != 'Practice' LIMIT {CHUNK_SIZE}
+            )
+        """)
+        deleted += cursor.rowcount
+        cursor.connection.commit()
+        if cursor.rowcount < CHUNK_SIZE:
+            return deleted
+
 if not os.path.exists(db_path):
     print(f"❌ Database file not found: {db_path}")
     exit(1)
@@ -23,20 +41,21 @@ print(f"📊 Migrating database: {db_path}")
 print("This will remove all non-Practice tasks and keep only Practice sessions.")
 print()
 
-# Connect to database
-conn = sqlite3.connect(db_path)
-cursor = conn.cursor()
+# Write connection - only opened once there is something to delete
+conn = None
 
 try:
-    # Count existing data
-    cursor.execute("SELECT COUNT(*) FROM TaskDefinitions WHERE task_type != 'Practice'")
-    non_practice_defs = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM TaskOccurrences WHERE task_type != 'Practice'")
-    non_practice_occurrences = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM TaskCompletions WHERE task_type != 'Practice'")
-    non_practice_completions = cursor.fetchone()[0]
+    # Count existing data on a read-only connection (all three tables in one query)
+    ro_conn = connect_read_only(db_path)
+    try:
+        non_practice_defs, non_practice_occurrences, non_practice_completions = ro_conn.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM TaskDefinitions WHERE task_type != 'Practice'),
+                (SELECT COUNT(*) FROM TaskOccurrences WHERE task_type != 'Practice'),
+                (SELECT COUNT(*) FROM TaskCompletions WHERE task_type != 'Practice')
+        """).fetchone()
+    finally:
+        ro_conn.close()
     
     print(f"Found:")
     print(f"  - {non_practice_defs} non-Practice task definitions")
@@ -46,45 +65,44 @@ try:
     
     if non_practice_defs == 0 and non_practice_occurrences == 0 and non_practice_completions == 0:
         print("✅ Database already contains only Practice tasks. No migration needed.")
-        conn.close()
         exit(0)
     
     # Confirm deletion
     response = input("Do you want to delete all non-Practice tasks? (yes/no): ")
     if response.lower() != 'yes':
         print("❌ Migration cancelled.")
-        conn.close()
         exit(0)
     
+    # Connect to database
+    conn = sqlite3.connect(db_path)
+    tune_connection(conn)
+    cursor = conn.cursor()
+    
     print()
     print("🗑️  Deleting non-Practice tasks...")
     
     # Delete non-Practice task completions first (they reference occurrences)
-    cursor.execute("DELETE FROM TaskCompletions WHERE task_type != 'Practice'")
-    deleted_completions = cursor.rowcount
+    deleted_completions = delete_non_practice(cursor, "TaskCompletions")
     print(f"  ✓ Deleted {deleted_completions} non-Practice task completions")
     
     # Delete non-Practice task occurrences
-    cursor.execute("DELETE FROM TaskOccurrences WHERE task_type != 'Practice'")
-    deleted_occurrences = cursor.rowcount
+    deleted_occurrences = delete_non_practice(cursor, "TaskOccurrences")
     print(f"  ✓ Deleted {deleted_occurrences} non-Practice task occurrences")
     
     # Delete non-Practice task definitions
-    cursor.execute("DELETE FROM TaskDefinitions WHERE task_type != 'Practice'")
-    deleted_defs = cursor.rowcount
+    deleted_defs = delete_non_practice(cursor, "TaskDefinitions")
     print(f"  ✓ Deleted {deleted_defs} non-Practice task definitions")
     
-    # Commit changes
-    conn.commit()
-    
     print()
     print("✅ Migration completed successfully!")
     print(f"   Removed {deleted_completions + deleted_occurrences + deleted_defs} non-Practice records")
     
 except Exception as e:
     print(f"❌ Error during migration: {e}")
-    conn.rollback()
+    if conn is not None:
+        conn.rollback()
     raise
 finally:
-    conn.close()
+    if conn is not None:
+        conn.close()
 
@@ -3,18 +3,23 @@ Migration script to create PracticeSessionDefinition and PracticeSession tables
 and migrate existing TaskOccurrences data to PracticeSession.
 """
 
+from sqlalchemy import text, bindparam, DateTime
 from database import (
-    Base, engine, SessionLocal, DBPracticeSessionDefinition, DBPracticeSession,
-    DBTaskOccurrence, DBPracticeSessionDefinition
+    Base, engine, SessionLocal, PracticeSessionDefinition as DBPracticeSessionDefinition,
+    PracticeSession as DBPracticeSession
 )
 from datetime import datetime
 from uuid_utils import generate_uuid
+from migration_utils import tune_connection
 
 def migrate_to_practice_sessions():
     """Create new tables and migrate data"""
     db = SessionLocal()
     
     try:
+        # Bulk-copy settings on the session's underlying sqlite3 connection
+        tune_connection(db.connection().connection.driver_connection)
+        
         print("Creating PracticeSessionDefinition and PracticeSession tables...")
         # Create new tables
         Base.metadata.create_all(bind=engine, tables=[
@@ -37,45 +42,33 @@ def migrate_to_practice_sessions():
             )
             db.add(practice_general)
             db.commit()
-            db.refresh(practice_general)
             print(f"✓ Created Practice General (ID: {practice_general.id})")
         else:
             print(f"✓ Practice General already exists (ID: {practice_general.id})")
         
-        # Migrate existing TaskOccurrences to PracticeSession
+        # Migrate existing TaskOccurrences to PracticeSession in one INSERT ... SELECT
+        # (same IDs; rows already migrated are skipped by the anti-join on PracticeSession's primary key)
         print("\nMigrating TaskOccurrences to PracticeSession...")
-        task_occurrences = db.query(DBTaskOccurrence).all()
-        
-        migrated_count = 0
-        for task_occ in task_occurrences:
-            # Check if already migrated
-            existing = db.query(DBPracticeSession).filter(
-                DBPracticeSession.id == task_occ.id
-            ).first()
-            
-            if existing:
-                print(f"  - TaskOccurrence {task_occ.id} already migrated, skipping")
-                continue
-            
-            # Create PracticeSession from TaskOccurrence
-            practice_session = DBPracticeSession(
-                id=task_occ.id,  # Keep same ID
-                instrument_id=task_occ.instrument_id,
-                practice_session_definition_id=practice_general.id,
-                due_date=task_occ.due_date,
-                start_time=None,  # Will be populated later
-                end_time=None,  # Will be populated later
-                duration=None,  # Will be populated later
-                completed=task_occ.completed,
-                completed_at=task_occ.completed_at,
-                notes=task_occ.notes,
-                photo_url=task_occ.photo_url,
-                created_at=task_occ.due_date if task_occ.due_date else datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            db.add(practice_session)
-            migrated_count += 1
+        result = db.execute(text("""
+            INSERT INTO PracticeSession
+                (id, instrument_id, practice_session_definition_id, start_time, end_time, duration,
+                 completed, completed_at, notes, photo_url, updated_at)
+            SELECT
+                t.id, t.instrument_id, :practice_general_id,
+                -- the session date now lives in start_time, written in SQLAlchemy's DateTime storage
+                -- format so it matches the app's start_time range filters
+                date(t.due_date) || ' 00:00:00.000000',
+                NULL, NULL,  -- end_time/duration populated later
+                t.completed, t.completed_at, t.notes, t.photo_url, :now
+            FROM TaskOccurrences t
+            LEFT JOIN PracticeSession p ON p.id = t.id
+            WHERE p.id IS NULL
+        """).bindparams(bindparam("now", type_=DateTime)),  # Typed, so SQLAlchemy formats it like any DateTime column
+            {"practice_general_id": practice_general.id, "now": datetime.utcnow()})
+        migrated_count = result.rowcount
         
+        # Refresh planner statistics now that PracticeSession holds the migrated rows
+        db.execute(text("ANALYZE"))
         db.commit()
         print(f"✓ Migrated {migrated_count} TaskOccurrences to PracticeSession")
         
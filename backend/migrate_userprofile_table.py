@@ -11,144 +11,188 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from sqlalchemy import create_engine, inspect, text
-from sqlalchemy.orm import sessionmaker
-from database import Base, UserProfile, engine, DATABASE_URL
-from datetime import datetime
+from sqlalchemy.schema import CreateTable, CreateIndex
+from database import UserProfile, engine, DATABASE_URL
+from datetime import datetime, date
+from uuid_utils import generate_uuid
+from migration_utils import tune_connection
 import sqlite3
 
-def backup_user_data():
-    """Backup existing user data to a list of dictionaries"""
-    if "sqlite" in DATABASE_URL:
-        db_file = DATABASE_URL.replace("sqlite:///", "")
-        if not os.path.exists(db_file):
-            return []
-        
-        conn = sqlite3.connect(db_file)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("SELECT * FROM UserProfile")
-            rows = cursor.fetchall()
-            data = [dict(row) for row in rows]
-            conn.close()
-            return data
-        except sqlite3.OperationalError:
-            # Table doesn't exist yet
-            conn.close()
-            return []
-    return []
+BACKUP_TABLE = "UserProfile_backup"
+# The copy is made under this name and renamed to BACKUP_TABLE once complete, so a table
+# named BACKUP_TABLE is always a finished backup
+PARTIAL_BACKUP_TABLE = "UserProfile_backup_partial"
+BACKUP_CHUNK_SIZE = 1000
 
-def restore_user_data(backup_data, engine):
-    """Restore user data to the recreated table"""
-    if not backup_data:
-        return
+def parse_date(value):
+    """Date strings from the backup -> date (None if unparseable)"""
+    if not isinstance(value, str):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+def parse_datetime(value):
+    """Datetime strings from the backup -> datetime (now if unparseable)"""
+    if not isinstance(value, str):
+        return value
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return datetime.utcnow()  # Same as the column default
+
+# Per-column normalization applied to every restored row (columns not listed are copied as-is)
+CONVERTERS = {
+    'id': lambda value: value or generate_uuid(),
+    'name': lambda value: value or "Unknown",
+    'date_of_birth': parse_date,
+    'created_at': parse_datetime,
+    'updated_at': parse_datetime,
+    'notifications_enabled': lambda value: bool(value) if value is not None else True,
+}
+
+def backup_user_data(conn):
+    """Copy existing user data into a backup table, returning the number of rows (None if there is no UserProfile table)"""
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name IN ('UserProfile', ?)", (BACKUP_TABLE,)
+    )
+    tables = {name for (name,) in cursor.fetchall()}
     
-    SessionLocal = sessionmaker(bind=engine)
-    db = SessionLocal()
+    if BACKUP_TABLE in tables:
+        # A finished backup left by an interrupted run - only safe to restore from if the
+        # run got as far as recreating UserProfile (empty); otherwise it may be stale
+        if "UserProfile" in tables and cursor.execute("SELECT EXISTS (SELECT 1 FROM UserProfile)").fetchone()[0]:
+            raise RuntimeError(
+                f"{BACKUP_TABLE} exists but UserProfile still has rows - check which copy is current "
+                f"and drop {BACKUP_TABLE} before re-running"
+            )
+        print(f"  Resuming from {BACKUP_TABLE} left by an interrupted run")
+    elif "UserProfile" not in tables:
+        return None
+    else:
+        # Copy under a temporary name, then rename - the rename marks the backup complete
+        cursor.execute(f"DROP TABLE IF EXISTS {PARTIAL_BACKUP_TABLE}")
+        cursor.execute(f"CREATE TABLE {PARTIAL_BACKUP_TABLE} AS SELECT * FROM UserProfile")
+        cursor.execute(f"ALTER TABLE {PARTIAL_BACKUP_TABLE} RENAME TO {BACKUP_TABLE}")
+        conn.commit()
     
+    cursor.execute(f"SELECT COUNT(*) FROM {BACKUP_TABLE}")
+    return cursor.fetchone()[0]
+
+def recreate_table_script():
+    """SQL script that drops UserProfile and recreates it (with its indexes) from the model definition"""
+    table = UserProfile.__table__
+    statements = ["DROP TABLE IF EXISTS UserProfile", str(CreateTable(table).compile(dialect=engine.dialect)).strip()]
+    statements += [str(CreateIndex(index).compile(dialect=engine.dialect)) for index in table.indexes]
+    # foreign_keys can't change inside a transaction, so it is switched off around it
+    return "PRAGMA foreign_keys = OFF; BEGIN; " + "; ".join(statements) + "; COMMIT; PRAGMA foreign_keys = ON;"
+
+def iter_backup(conn):
+    """Yield the backed-up rows as lists of dictionaries, BACKUP_CHUNK_SIZE rows at a time"""
+    cursor = conn.execute(f"SELECT * FROM {BACKUP_TABLE}")
+    keys = [description[0] for description in cursor.description]
+    while True:
+        rows = cursor.fetchmany(BACKUP_CHUNK_SIZE)
+        if not rows:
+            return
+        yield [dict(zip(keys, row)) for row in rows]
+
+def column_default(column):
+    """Python-side default for a column missing from the backup (None if it has none)"""
+    if column.default is None:
+        return None
+    return column.default.arg(None) if column.default.is_callable else column.default.arg
+
+def restore_user_data(conn, backup_count):
+    """Restore user data from the backup table to the recreated table, then drop the backup"""
+    # Prepared once: one positional INSERT, plus each column's SQLite bind conversion
+    # (the same date/datetime/boolean storage format the ORM writes)
+    columns = UserProfile.__table__.columns
+    insert_sql = f"INSERT INTO UserProfile ({', '.join(columns.keys())}) VALUES ({', '.join('?' * len(columns))})"
+    bind_processors = [column.type.dialect_impl(engine.dialect).bind_processor(engine.dialect) for column in columns]
+    restored = 0
     try:
-        restored_count = 0
-        for user_data in backup_data:
-            try:
-                # Create a new UserProfile instance from backup data
-                user = UserProfile()
-                
-                # Map old column names to new model attributes
-                for key, value in user_data.items():
-                    if hasattr(user, key):
-                        # Handle date strings
-                        if key == 'date_of_birth' and isinstance(value, str):
-                            try:
-                                from datetime import date
-                                user.date_of_birth = date.fromisoformat(value)
-                            except:
-                                user.date_of_birth = None
-                        # Handle datetime strings
-                        elif key in ('created_at', 'updated_at') and isinstance(value, str):
-                            try:
-                                from datetime import datetime
-                                user.__dict__[key] = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                            except:
-                                pass
-                        # Handle boolean
-                        elif key == 'notifications_enabled':
-                            user.notifications_enabled = bool(value) if value is not None else True
-                        # Handle other fields
-                        else:
-                            setattr(user, key, value)
+        # Single transaction; each chunk is normalized and inserted with one executemany
+        with conn:
+            plan = None
+            for chunk in iter_backup(conn):
+                if plan is None:
+                    # (column, in backup, converter, bind processor) - columns missing from the
+                    # backup get their Python-side defaults; extra backup columns are dropped
+                    plan = [
+                        (column, column.name in chunk[0], CONVERTERS.get(column.name), process)
+                        for column, process in zip(columns, bind_processors)
+                    ]
                 
-                # Ensure required fields are present
-                if not user.id:
-                    from uuid_utils import generate_uuid
-                    user.id = generate_uuid()
-                if not user.name:
-                    user.name = "Unknown"
+                rows = []
+                for user_data in chunk:
+                    try:
+                        values = []
+                        for column, in_backup, convert, process in plan:
+                            value = user_data[column.name] if in_backup else column_default(column)
+                            if convert:
+                                value = convert(value)
+                            values.append(process(value) if process else value)
+                        rows.append(tuple(values))
+                    except Exception as e:
+                        print(f"  Warning: Could not restore user {user_data.get('id', 'unknown')}: {e}")
+                        continue
                 
-                db.add(user)
-                restored_count += 1
-            except Exception as e:
-                print(f"  Warning: Could not restore user {user_data.get('id', 'unknown')}: {e}")
-                continue
-        
-        db.commit()
-        print(f"  Restored {restored_count} of {len(backup_data)} user profile(s)")
+                if rows:
+                    conn.executemany(insert_sql, rows)
+                    restored += len(rows)
+            
+            # Dropped even when it held no rows, so a later run never mistakes it for an interrupted one
+            conn.execute(f"DROP TABLE {BACKUP_TABLE}")
+        print(f"  Restored {restored} of {backup_count} user profile(s)")
     except Exception as e:
-        db.rollback()
         print(f"  Error during restore: {e}")
         raise
-    finally:
-        db.close()
 
 def migrate_userprofile_table():
     """Recreate UserProfile table to match the model definition"""
     print("Starting UserProfile table migration...")
     print("-" * 60)
     
-    # Backup existing data
-    print("1. Backing up existing data...")
-    backup_data = backup_user_data()
-    if backup_data:
-        print(f"  Backed up {len(backup_data)} user profile(s)")
-    else:
-        print("  No existing data to backup")
+    if "sqlite" not in DATABASE_URL:
+        print("  This migration only supports SQLite databases")
+        return
     
-    # Drop and recreate the table
-    print("\n2. Dropping old UserProfile table...")
-    with engine.connect() as conn:
-        # Disable foreign keys temporarily
-        if "sqlite" in DATABASE_URL:
-            conn.execute(text("PRAGMA foreign_keys = OFF"))
+    # Backup, DDL, verification and restore all share one sqlite3 connection
+    conn = sqlite3.connect(DATABASE_URL.replace("sqlite:///", ""))
+    tune_connection(conn)
+    try:
+        # Backup existing data
+        print("1. Backing up existing data...")
+        backup_count = backup_user_data(conn)
+        if backup_count:
+            print(f"  Backed up {backup_count} user profile(s)")
+        else:
+            print("  No existing data to backup")
         
-        # Drop the table
-        UserProfile.__table__.drop(engine, checkfirst=True)
+        # Drop and recreate the table in one script
+        print("\n2. Recreating UserProfile table...")
+        conn.executescript(recreate_table_script())
         print("  Old table dropped")
-        
-        # Recreate the table
-        print("\n3. Creating new UserProfile table...")
-        Base.metadata.create_all(bind=engine, tables=[UserProfile.__table__])
         print("  New table created")
         
-        # Re-enable foreign keys
-        if "sqlite" in DATABASE_URL:
-            conn.execute(text("PRAGMA foreign_keys = ON"))
-        conn.commit()
-    
-    # Verify table structure
-    print("\n4. Verifying table structure...")
-    inspector = inspect(engine)
-    columns = inspector.get_columns('UserProfile')
-    print(f"  Table has {len(columns)} columns:")
-    for col in columns:
-        nullable = "NULL" if col['nullable'] else "NOT NULL"
-        default = f" DEFAULT {col['default']}" if col['default'] is not None else ""
-        print(f"    - {col['name']}: {col['type']} {nullable}{default}")
-    
-    # Restore data
-    if backup_data:
-        print("\n5. Restoring user data...")
-        restore_user_data(backup_data, engine)
+        # Verify table structure
+        print("\n3. Verifying table structure...")
+        columns = conn.execute("PRAGMA table_info(UserProfile)").fetchall()
+        print(f"  Table has {len(columns)} columns:")
+        for _, name, column_type, notnull, default_value, _ in columns:
+            nullable = "NOT NULL" if notnull else "NULL"
+            default = f" DEFAULT {default_value}" if default_value is not None else ""
+            print(f"    - {name}: {column_type} {nullable}{default}")
+        
+        # Restore data (and drop the backup table)
+        if backup_count is not None:
+            print("\n4. Restoring user data...")
+            restore_user_data(conn, backup_count)
+    finally:
+        conn.close()
     
     print("\n" + "=" * 60)
     print("✓ Migration completed successfully!")
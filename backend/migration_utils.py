@@ -0,0 +1,27 @@
+"""
+Shared helpers for the one-off SQLite migration scripts
+"""
+
+import sqlite3
+from pathlib import Path
+
+# Bulk-rewrite settings for migration connections (the app's own connections stay on the
+# lighter settings in database.py - a 64MB page cache per pooled connection would be wasteful)
+MIGRATION_PRAGMAS = (
+    "journal_mode=WAL",  # Same persistent journal mode the app uses
+    "synchronous=NORMAL",  # No fsync per commit in WAL mode
+    "temp_store=MEMORY",  # Sorts/temp tables for index builds stay in memory
+    "cache_size=-65536",  # 64MB page cache so table copies don't thrash
+    "mmap_size=268435456",  # Memory-map up to 256MB of the database file
+)
+
+
+def tune_connection(conn: sqlite3.Connection):
+    """Apply MIGRATION_PRAGMAS to a freshly opened sqlite3 connection"""
+    for pragma in MIGRATION_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
+
+
+def connect_read_only(db_path: str) -> sqlite3.Connection:
+    """Open db_path read-only, for checking whether a migration has anything to do"""
+    return sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
@@ -0,0 +1,74 @@
+"""
+Migration script to rewrite PracticeSession timestamps in SQLAlchemy's DateTime storage format
+('YYYY-MM-DD HH:MM:SS.ffffff', naive UTC). The app's start_time range filters compare these
+values as strings, so rows written in any other form (e.g. by older migrations) are mis-bucketed.
+Run this once to update existing database
+"""
+
+import sqlite3
+import os
+from datetime import datetime, timezone
+from migration_utils import tune_connection
+
+# DateTime columns rewritten by this script
+DATETIME_COLUMNS = ("start_time", "end_time", "completed_at", "updated_at")
+
+# Format SQLAlchemy's SQLite DateTime type stores - always 26 characters
+STORAGE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+def normalize_value(value: str):
+    """Parse a stored ISO date/datetime and return it in STORAGE_FORMAT (None if unparseable)"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime(STORAGE_FORMAT)
+
+def normalize_practice_session_times():
+    """Rewrite non-canonical PracticeSession timestamps in place"""
+    db_path = 'practice_tracker.db'
+    
+    if not os.path.exists(db_path):
+        print(f"Database file not found: {db_path}")
+        return
+    
+    conn = sqlite3.connect(db_path)
+    tune_connection(conn)
+    
+    try:
+        total_fixed = 0
+        with conn:
+            for column in DATETIME_COLUMNS:
+                # Only values not already in the 26-character 'YYYY-MM-DD HH:MM:SS.ffffff' form
+                rows = conn.execute(f"""
+                    SELECT rowid, {column} FROM PracticeSession
+                    WHERE {column} IS NOT NULL AND (length({column}) != 26 OR substr({column}, 11, 1) != ' ')
+                """).fetchall()
+                
+                updates = []
+                for rowid, value in rows:
+                    normalized = normalize_value(str(value))
+                    if normalized is None:
+                        print(f"⚠️  Skipping unparseable {column} value {value!r} (rowid {rowid})")
+                    else:
+                        updates.append((normalized, rowid))
+                
+                conn.executemany(f"UPDATE PracticeSession SET {column} = ? WHERE rowid = ?", updates)
+                print(f"✓ {column}: {len(updates)} value(s) normalized")
+                total_fixed += len(updates)
+        
+        if total_fixed:
+            print(f"\n✅ Normalized {total_fixed} timestamp(s)")
+        else:
+            print("\n✅ All PracticeSession timestamps already in storage format. No migration needed.")
+    
+    except Exception as e:
+        print(f"\n❌ Error during migration: {e}")
+        raise
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    normalize_practice_session_times()
@@ -18,28 +18,25 @@ def remove_equipment_table():
     cursor = conn.cursor()
     
     try:
-        # Check if Equipment table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='Equipment'")
-        equipment_exists = cursor.fetchone() is not None
+        # Read the table catalog once and answer every check from it
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type='table'")
+        tables = cursor.fetchall()
+        table_names = [name for name, _ in tables]
         
-        if not equipment_exists:
+        # Check if Equipment table exists
+        if 'Equipment' not in table_names:
             print("Equipment table not found - it may have already been removed or migrated to Instrument")
             conn.close()
             return
         
         # Check if there are any foreign key constraints referencing Equipment
         print("Checking for foreign key constraints...")
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' 
-            AND sql LIKE '%Equipment%'
-        """)
-        referencing_tables = cursor.fetchall()
+        referencing_tables = [name for name, sql in tables if sql and 'equipment' in sql.lower()]  # LIKE is case-insensitive
         
         if referencing_tables:
             print("Warning: The following tables may reference Equipment:")
             for table in referencing_tables:
-                print(f"  - {table[0]}")
+                print(f"  - {table}")
             print("\nNote: If you've already migrated to Instrument, these references should be updated.")
         
         # Drop the Equipment table
@@ -48,17 +45,15 @@ def remove_equipment_table():
         conn.commit()
         print("✓ Equipment table removed successfully")
         
-        # Verify removal
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        remaining_tables = [row[0] for row in cursor.fetchall()]
+        # Remaining tables are the catalog minus Equipment
+        remaining_tables = [name for name in table_names if name != 'Equipment']
         
         print("\nRemaining tables in database:")
         for table in remaining_tables:
             print(f"  - {table}")
         
         # Check if Instrument table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='Instrument'")
-        instrument_exists = cursor.fetchone() is not None
+        instrument_exists = 'Instrument' in table_names
         
         if instrument_exists:
             print("\n✓ Instrument table found - migration appears successful")
@@ -34,21 +34,26 @@ def remove_old_tables():
     ]
     
     print("\nRemoving old snake_case tables...")
+    to_drop = [table_name for table_name in old_tables if table_name in tables]
     for table_name in old_tables:
-        if table_name in tables:
-            try:
-                cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
-                print(f"  ✓ Dropped: {table_name}")
-            except Exception as e:
-                print(f"  ✗ Error dropping {table_name}: {e}")
-        else:
+        if table_name not in tables:
             print(f"  - {table_name} not found (already removed or doesn't exist)")
     
-    conn.commit()
+    # Drop them all in one script and one transaction
+    dropped = set()
+    if to_drop:
+        drops = " ".join(f"DROP TABLE IF EXISTS {table_name};" for table_name in to_drop)
+        try:
+            cursor.executescript(f"BEGIN; {drops} COMMIT;")
+            dropped.update(to_drop)
+            for table_name in to_drop:
+                print(f"  ✓ Dropped: {table_name}")
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"  ✗ Error dropping old tables: {e}")
     
-    # Check remaining tables
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    remaining_tables = [row[0] for row in cursor.fetchall()]
+    # Remaining tables follow from the listing above (a failed script drops nothing)
+    remaining_tables = [table for table in tables if table not in dropped]
     
     print("\nRemaining tables:")
     if remaining_tables:
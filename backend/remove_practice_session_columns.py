@@ -4,7 +4,43 @@ Migration script to remove 'due_date' and 'created_at' columns from PracticeSess
 
 import sqlite3
 import os
-from datetime import datetime
+from datetime import datetime, timezone
+from migration_utils import tune_connection
+
+# PRAGMA user_version recorded once due_date/created_at are gone, so re-runs stop after one read
+SCHEMA_VERSION = 2
+
+# Above this many rows the copy runs as separate rowid-range transactions, so the write lock is
+# released between chunks and readers/WAL checkpoints can make progress during the migration
+COPY_CHUNK_THRESHOLD = 100000
+COPY_CHUNK_SIZE = 20000
+
+# Every column except due_date and created_at, copied unchanged (the date lives in start_time)
+COPY_SQL = """
+    INSERT INTO PracticeSession_new 
+    (id, instrument_id, practice_session_definition_id, start_time, end_time, 
+     duration, completed, completed_at, notes, photo_url, updated_at)
+    SELECT 
+        id, instrument_id, practice_session_definition_id, start_time, end_time,
+        duration, completed, completed_at, notes, photo_url, updated_at
+    FROM PracticeSession
+"""
+# Re-copies rows already in PracticeSession_new, replacing the earlier copy by primary key
+RECOPY_SQL = COPY_SQL.replace("INSERT INTO", "INSERT OR REPLACE INTO", 1)
+
+def copy_in_chunks(cursor, first_rowid, last_rowid):
+    """Copy PracticeSession rows into PracticeSession_new one committed rowid range at a time"""
+    start = first_rowid
+    while start <= last_rowid:
+        end = start + COPY_CHUNK_SIZE - 1
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(COPY_SQL + " WHERE rowid BETWEEN ? AND ?", (start, end))
+        cursor.execute("COMMIT")
+        # Let a checkpoint run between chunks instead of growing the WAL for the whole copy
+        cursor.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        print(f"  Copied rows up to rowid {min(end, last_rowid)} of {last_rowid}")
+        start = end + 1
+    return last_rowid
 
 def migrate_practice_session_table():
     """Remove due_date and created_at columns from PracticeSession table"""
@@ -14,10 +50,17 @@ def migrate_practice_session_table():
         print(f"Database file not found: {db_path}")
         return
     
-    conn = sqlite3.connect(db_path)
+    # Autocommit mode - the module never opens implicit transactions; the rebuild manages its own
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    tune_connection(conn)
     cursor = conn.cursor()
     
     try:
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= SCHEMA_VERSION:
+            print("✅ PracticeSession already migrated (schema version marker set). No migration needed.")
+            return
+        
         # SQLite doesn't support DROP COLUMN directly, so we need to:
         # 1. Create a new table without the columns
         # 2. Copy data (extracting date from start_time for any legacy due_date usage)
@@ -25,22 +68,37 @@ def migrate_practice_session_table():
         # 4. Rename new table
         
         print("Checking current PracticeSession table structure...")
-        cursor.execute("PRAGMA table_info(PracticeSession)")
-        columns = cursor.fetchall()
-        print(f"Current columns: {[col[1] for col in columns]}")
-        
-        # Check if columns exist
-        column_names = [col[1] for col in columns]
-        has_due_date = 'due_date' in column_names
-        has_created_at = 'created_at' in column_names
+        # Column list and count of the columns to remove, in one query over pragma_table_info
+        # (the membership test is SQLite's IN over a constant list - no Python list/set is built)
+        cursor.execute("""
+            SELECT group_concat(name, ', '), SUM(name IN ('due_date', 'created_at'))
+            FROM pragma_table_info('PracticeSession')
+        """)
+        column_list, columns_to_remove = cursor.fetchone()
+        print(f"Current columns: {column_list or '(none)'}")
         
-        if not has_due_date and not has_created_at:
+        if not columns_to_remove:
             print("✅ Columns 'due_date' and 'created_at' already removed. No migration needed.")
-            conn.close()
             return
         
         print("\nCreating new PracticeSession table without due_date and created_at...")
         
+        # No per-row foreign key checks during the copy/drop/rename (SQLite's table-rebuild procedure);
+        # this can't change inside a transaction, so it is set first. Checked once before COMMIT instead
+        cursor.execute("PRAGMA foreign_keys=OFF")
+        
+        cursor.execute("SELECT COUNT(*), MIN(rowid), MAX(rowid) FROM PracticeSession")
+        row_count, first_rowid, last_rowid = cursor.fetchone()
+        chunked = row_count > COPY_CHUNK_THRESHOLD
+        
+        # Small tables: the whole rebuild runs in one explicit transaction, holding the write lock
+        # from the start. Large tables: only the final swap does; the copy commits chunk by chunk
+        if not chunked:
+            cursor.execute("BEGIN IMMEDIATE")
+        
+        # Left behind if an earlier chunked copy was interrupted before the swap
+        cursor.execute("DROP TABLE IF EXISTS PracticeSession_new")
+        
         # Create new table structure (without due_date and created_at)
         cursor.execute("""
             CREATE TABLE PracticeSession_new (
@@ -60,30 +118,22 @@ def migrate_practice_session_table():
             )
         """)
         
-        # Copy data from old table to new table
         print("Copying data to new table...")
-        if has_due_date:
-            # If due_date exists, we'll ignore it (date is in start_time)
-            cursor.execute("""
-                INSERT INTO PracticeSession_new 
-                (id, instrument_id, practice_session_definition_id, start_time, end_time, 
-                 duration, completed, completed_at, notes, photo_url, updated_at)
-                SELECT 
-                    id, instrument_id, practice_session_definition_id, start_time, end_time,
-                    duration, completed, completed_at, notes, photo_url, updated_at
-                FROM PracticeSession
-            """)
+        if chunked:
+            # Every app write sets updated_at (naive UTC, SQLAlchemy's DateTime format), so rows
+            # changed once the copy has started compare >= this string
+            copy_started_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+            copied_through = copy_in_chunks(cursor, first_rowid, last_rowid)
+            
+            # Reconcile under the write lock, then swap: the app could write between chunks
+            cursor.execute("BEGIN IMMEDIATE")
+            # Sessions deleted since their chunk was copied
+            cursor.execute("DELETE FROM PracticeSession_new WHERE id NOT IN (SELECT id FROM PracticeSession)")
+            # Sessions updated since the copy started, and rows added after the last chunk
+            cursor.execute(RECOPY_SQL + " WHERE updated_at >= ? OR rowid > ?", (copy_started_at, copied_through))
         else:
-            # If no due_date, just copy all columns except created_at
-            cursor.execute("""
-                INSERT INTO PracticeSession_new 
-                (id, instrument_id, practice_session_definition_id, start_time, end_time, 
-                 duration, completed, completed_at, notes, photo_url, updated_at)
-                SELECT 
-                    id, instrument_id, practice_session_definition_id, start_time, end_time,
-                    duration, completed, completed_at, notes, photo_url, updated_at
-                FROM PracticeSession
-            """)
+            # Copy data from old table to new table in one statement
+            cursor.execute(COPY_SQL)
         
         # Drop old table
         print("Dropping old PracticeSession table...")
@@ -98,14 +148,29 @@ def migrate_practice_session_table():
         cursor.execute("CREATE INDEX IF NOT EXISTS ix_PracticeSession_start_time ON PracticeSession(start_time)")
         cursor.execute("CREATE INDEX IF NOT EXISTS ix_PracticeSession_instrument_id ON PracticeSession(instrument_id)")
         
-        conn.commit()
+        # Planner statistics for the rebuilt table and its new indexes, in the same transaction
+        cursor.execute("ANALYZE PracticeSession")
+        
+        # One foreign key pass over the copied rows (reported, not fatal - the old table had no enforcement)
+        cursor.execute("PRAGMA foreign_key_check(PracticeSession)")
+        dangling = cursor.fetchall()
+        if dangling:
+            print(f"⚠️  {len(dangling)} PracticeSession row(s) reference a missing Instrument or definition")
+        
+        # Committed with the rebuild - a crash before COMMIT leaves the marker unset and the script retriable
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        
+        cursor.execute("COMMIT")
+        # Fold the rebuild's WAL back into the database file before closing
+        cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
         print("\n✅ Migration completed successfully!")
         print("   - Removed 'due_date' column")
         print("   - Removed 'created_at' column")
         print("   - Date information is now extracted from 'start_time' when needed")
         
     except Exception as e:
-        conn.rollback()
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
         print(f"\n❌ Error during migration: {e}")
         raise
     finally:
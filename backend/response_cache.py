@@ -0,0 +1,136 @@
+"""
+Response cache for read-mostly endpoints
+Uses Redis when REDIS_URL is set (and the redis package is installed),
+otherwise falls back to an in-process TTL cache (per worker, short-lived - see MEMORY_CACHE_MAX_TTL)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+try:
+    import redis
+except ImportError:  # Redis is optional - the in-process cache is used instead
+    redis = None
+
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_PREFIX = "pt-cache:"
+# Bumped by every clear - kept outside CACHE_PREFIX so clearing never deletes (and resets) it
+GENERATION_KEY = "pt-cache-generation"
+# Entry cap for the in-process cache - keys include request values and the date, so it must not grow unbounded
+MEMORY_CACHE_MAX_ENTRIES = 1024
+# Longest the in-process cache trusts an entry, whatever TTL the caller asks for: cache_clear only
+# reaches the worker that ran the write, so with several workers other workers' entries go stale.
+# Run multi-worker deployments with REDIS_URL set for full-TTL caching with shared invalidation
+MEMORY_CACHE_MAX_TTL = int(os.getenv("MEMORY_CACHE_MAX_TTL", "5"))
+
+
+class RedisCache:
+    """Cache backed by a shared Redis server (consistent across uvicorn workers)"""
+
+    def __init__(self, url: str):
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get(CACHE_PREFIX + key)
+        except redis.RedisError:
+            return None  # Treat an unreachable cache as a miss
+
+    def generation(self) -> Optional[int]:
+        try:
+            return int(self.client.get(GENERATION_KEY) or 0)
+        except redis.RedisError:
+            return None
+
+    def set(self, key: str, value: bytes, expire: int, generation: Optional[int] = None):
+        try:
+            if generation is None:
+                self.client.set(CACHE_PREFIX + key, value, ex=expire)
+                return
+            # Only store if no clear happened since `generation` was read (WATCH aborts the
+            # transaction with WatchError if a clear bumps the counter in between)
+            with self.client.pipeline() as pipe:
+                pipe.watch(GENERATION_KEY)
+                if int(pipe.get(GENERATION_KEY) or 0) != generation:
+                    return
+                pipe.multi()
+                pipe.set(CACHE_PREFIX + key, value, ex=expire)
+                pipe.execute()
+        except redis.RedisError:
+            pass
+
+    def clear(self, prefix: str = ""):
+        try:
+            # Bumped before deleting, so a build that read the old generation can't store afterwards
+            self.client.incr(GENERATION_KEY)
+            keys = list(self.client.scan_iter(match=CACHE_PREFIX + prefix + "*"))
+            if keys:
+                self.client.delete(*keys)
+        except redis.RedisError:
+            pass
+
+
+class MemoryCache:
+    """In-process cache with per-key expiry, evicting the least recently used entry when full"""
+
+    def __init__(self, max_entries: int = MEMORY_CACHE_MAX_ENTRIES):
+        self.entries = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self.max_entries = max_entries
+        self.current_generation = 0  # Bumped by every clear
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def generation(self) -> Optional[int]:
+        return self.current_generation
+
+    def set(self, key: str, value: bytes, expire: int, generation: Optional[int] = None):
+        with self.lock:
+            if generation is not None and generation != self.current_generation:
+                return  # Cleared while the value was being built - it may already be stale
+            self.entries[key] = (time.monotonic() + min(expire, MEMORY_CACHE_MAX_TTL), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self, prefix: str = ""):
+        with self.lock:
+            self.current_generation += 1
+            for key in [k for k in self.entries if k.startswith(prefix)]:
+                del self.entries[key]
+
+
+cache = RedisCache(REDIS_URL) if REDIS_URL and redis is not None else MemoryCache()
+
+
+def cache_get(key: str) -> Optional[bytes]:
+    """Get a cached value, or None on a miss"""
+    return cache.get(key)
+
+
+def cache_generation() -> Optional[int]:
+    """Current clear generation - read before building a value and pass it to cache_set"""
+    return cache.generation()
+
+
+def cache_set(key: str, value: bytes, expire: int, generation: Optional[int] = None):
+    """Store a value for `expire` seconds, skipped if the cache was cleared since `generation`"""
+    cache.set(key, value, expire, generation)
+
+
+def cache_clear(prefix: str = ""):
+    """Invalidate all keys starting with prefix"""
+    cache.clear(prefix)
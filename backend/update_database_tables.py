@@ -3,36 +3,40 @@ Script to update database table names to PascalCase
 This will drop all old tables and recreate with new names
 """
 
-from database import Base, engine, init_db
+from database import Base, engine
 from database import UserProfile, Instrument, TaskDefinition, TaskOccurrence, TaskCompletion
-import sqlite3
 
-def check_current_tables():
-    """Check what tables currently exist"""
-    conn = sqlite3.connect('practice_tracker.db')
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return tables
+def check_current_tables(conn=None):
+    """Check what tables currently exist (on conn, or a pooled engine connection if not given)"""
+    if conn is None:
+        with engine.connect() as conn:
+            return check_current_tables(conn)
+    return [row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table'")]
 
 def recreate_database():
     """Drop all tables and recreate with PascalCase names"""
-    print("Current tables in database:")
-    old_tables = check_current_tables()
-    for table in old_tables:
-        print(f"  - {table}")
-    
-    print("\nDropping all tables...")
-    Base.metadata.drop_all(bind=engine)
-    
-    print("Creating new tables with PascalCase names...")
-    init_db()
-    
-    print("\nNew tables in database:")
-    new_tables = check_current_tables()
-    for table in new_tables:
-        print(f"  - {table}")
+    # One pooled engine connection (WAL/synchronous pragmas already applied) for the whole run
+    with engine.connect() as conn:
+        print("Current tables in database:")
+        old_tables = check_current_tables(conn)
+        for table in old_tables:
+            print(f"  - {table}")
+        
+        # All DROP/CREATE statements share one transaction - pysqlite doesn't open one for DDL itself
+        conn.exec_driver_sql("BEGIN")
+        
+        print("\nDropping all tables...")
+        Base.metadata.drop_all(bind=conn)
+        
+        print("Creating new tables with PascalCase names...")
+        Base.metadata.create_all(bind=conn)
+        
+        conn.commit()
+        
+        print("\nNew tables in database:")
+        new_tables = check_current_tables(conn)
+        for table in new_tables:
+            print(f"  - {table}")
     
     print("\n✅ Database updated successfully!")
     print("Expected tables: UserProfile, Instrument, TaskDefinitions, TaskOccurrences, TaskCompletions")
@@ -2,16 +2,51 @@
 UUID generation and validation utilities for offline-sync database
 """
 
+import os
+import threading
 import uuid
 from typing import Optional
 
+# Bound once at import - is_valid_uuid runs on every validated ID
+_UUID = uuid.UUID
+
+# generate_uuid runs for every primary key insert: random bytes are fetched from
+# os.urandom for UUID_BATCH_SIZE UUIDs at a time instead of one syscall per UUID
+UUID_BATCH_SIZE = 4096
+_random_bytes = b""
+_random_offset = 0
+_random_lock = threading.Lock()
+
+
+def _discard_random_bytes():
+    """Drop buffered random bytes - a forked child must never reuse its parent's"""
+    global _random_bytes, _random_offset
+    _random_bytes = b""
+    _random_offset = 0
+
+
+if hasattr(os, "register_at_fork"):  # Not available on Windows (no fork there)
+    os.register_at_fork(after_in_child=_discard_random_bytes)
+
 
 def generate_uuid() -> str:
     """
     Generate a new UUID4 (random UUID) as a string.
     Used for primary keys to enable offline-sync without ID collisions.
     """
-    return str(uuid.uuid4())
+    global _random_bytes, _random_offset
+    with _random_lock:
+        if _random_offset >= len(_random_bytes):
+            _random_bytes = os.urandom(16 * UUID_BATCH_SIZE)
+            _random_offset = 0
+        raw = bytearray(_random_bytes[_random_offset:_random_offset + 16])
+        _random_offset += 16
+    
+    # Set the version (4) and RFC 4122 variant bits, as uuid.uuid4() does
+    raw[6] = (raw[6] & 0x0F) | 0x40
+    raw[8] = (raw[8] & 0x3F) | 0x80
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
 
 
 def is_valid_uuid(uuid_string: str) -> bool:
@@ -19,7 +54,7 @@ def is_valid_uuid(uuid_string: str) -> bool:
     Validate if a string is a valid UUID format.
     """
     try:
-        uuid.UUID(uuid_string)
+        _UUID(uuid_string)
         return True
     except (ValueError, TypeError):
         return False
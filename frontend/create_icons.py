@@ -1,15 +1,15 @@
 #!/usr/bin/env python
 """Create simple placeholder icons for the PWA"""
 
+from pathlib import Path
+
 try:
     from PIL import Image, ImageDraw, ImageFont
-    import os
 except ImportError:
     print("Pillow not installed. Installing...")
     import subprocess
     subprocess.check_call(['pip', 'install', 'Pillow'])
     from PIL import Image, ImageDraw, ImageFont
-    import os
 
 # Icon sizes needed
 sizes = [72, 96, 128, 144, 152, 192, 384, 512]
@@ -18,42 +18,69 @@ sizes = [72, 96, 128, 144, 152, 192, 384, 512]
 color = (44, 85, 48)  # #2C5530
 
 # Create icons directory if it doesn't exist
-os.makedirs('icons', exist_ok=True)
+icons_dir = Path('icons')
+icons_dir.mkdir(exist_ok=True)
 
-for size in sizes:
-    # Create image with theme color
+def resolve_font_path():
+    """Find a usable system TrueType font once per run (None if there isn't one)"""
+    for font_path in ("arial.ttf", "C:/Windows/Fonts/arial.ttf"):
+        try:
+            ImageFont.truetype(font_path, 12)
+            return font_path
+        except OSError:
+            continue
+    return None
+
+font_path = resolve_font_path()
+
+def icon_text(size):
+    """Symbol drawn on an icon of this size (None below 96px, where it would be illegible)"""
+    # A simple "M" for Music at mid sizes, the music note symbol (🎵) on the large ones
+    if size >= 192:
+        return "🎵"
+    if size >= 96:
+        return "M"
+    return None
+
+def render_icon(size, text):
+    """Render one icon at full size with its symbol centred on the theme color"""
     img = Image.new('RGB', (size, size), color=color)
+    if text is None:
+        return img
     
-    # Add a simple music note symbol (🎵) if size is large enough
-    if size >= 96:
-        draw = ImageDraw.Draw(img)
-        try:
-            # Try to use a system font
-            font_size = size // 3
-            try:
-                font = ImageFont.truetype("arial.ttf", font_size)
-            except:
-                try:
-                    font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", font_size)
-                except:
-                    font = ImageFont.load_default()
-            
-            # Draw a simple "M" for Music (or you could draw a note symbol)
-            text = "🎵" if size >= 192 else "M"
-            # Get text bounding box
-            bbox = draw.textbbox((0, 0), text, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            # Center the text
-            position = ((size - text_width) // 2, (size - text_height) // 2)
-            draw.text(position, text, fill=(255, 255, 255), font=font)
-        except Exception as e:
-            print(f"Could not add text to {size}x{size} icon: {e}")
-            # Just use solid color if text fails
+    draw = ImageDraw.Draw(img)
+    try:
+        # Use the system font found above (no per-size font file probing)
+        font_size = size // 3
+        font = ImageFont.truetype(font_path, font_size) if font_path else ImageFont.load_default()
+        
+        # Get text bounding box
+        bbox = draw.textbbox((0, 0), text, font=font)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+        # Center the text
+        position = ((size - text_width) // 2, (size - text_height) // 2)
+        draw.text(position, text, fill=(255, 255, 255), font=font)
+    except Exception as e:
+        print(f"Could not add text to {size}x{size} icon: {e}")
+        # Just use solid color if text fails
+    return img
+
+# Each symbol is rasterized once, at the largest size that uses it; smaller icons are
+# LANCZOS downscales of that master rather than fresh text renders
+masters = {}
+for size in sorted(sizes, reverse=True):
+    text = icon_text(size)
+    if text not in masters:
+        masters[text] = render_icon(size, text)
+
+for size in sizes:
+    master = masters[icon_text(size)]
+    img = master if master.size == (size, size) else master.resize((size, size), Image.LANCZOS)
     
     # Save icon
-    filename = f'icons/icon-{size}x{size}.png'
-    img.save(filename)
+    filename = icons_dir / f'icon-{size}x{size}.png'
+    img.save(filename, optimize=True)
     print(f"Created {filename}")
 
 print("\n✅ All icons created successfully!")
@@ -0,0 +1,27 @@
+"""
+Shared helpers for the placeholder icon scripts
+"""
+
+from pathlib import Path
+
+# Minimal valid 1x1 pixel PNG, stored as a bytes literal so no script has to base64-decode it
+# (base64: iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==)
+MINIMAL_PNG = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\rIDATx\xdacd\xf8\xcfP\x0f\x00\x03\x86\x01\x80Z4}k\x00\x00\x00\x00IEND\xaeB`\x82'
+
+# Icon sizes needed by manifest.json
+ICON_SIZES = [72, 96, 128, 144, 152, 192, 384, 512]
+
+
+def icon_path(icons_dir: Path, size: int) -> Path:
+    """Path of the icon file for one size"""
+    return icons_dir / f'icon-{size}x{size}.png'
+
+
+def write_icons(data: bytes, icons_dir: str = 'icons') -> list:
+    """Write the same PNG data for every size in ICON_SIZES, returning the paths written"""
+    directory = Path(icons_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = [icon_path(directory, size) for size in ICON_SIZES]
+    for path in paths:
+        path.write_bytes(data)  # One write per file, no buffered writer
+    return paths